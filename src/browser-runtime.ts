@@ -1,12 +1,13 @@
-import { Camoufox, type LaunchOptions } from "camoufox-js";
+import type { LaunchOptions } from "camoufox-js";
 import type { Browser, BrowserContext, Page, Response, Route } from "playwright-core";
 import chalk from "chalk";
 import { parseAndValidateBrowserRequestUrl, validateBrowserRequestUrl, validateTargetUrl } from "./policy.js";
-import { DEFAULT_WAIT_STRATEGY, GUARD_SETTLE_MS, LAUNCH_TIMEOUT_MS, MAX_CONCURRENCY, MAX_GUARDED_REQUESTS, MAX_QUEUE, QUEUE_TIMEOUT_MS } from "./config.js";
+import { DEFAULT_WAIT_STRATEGY, GUARD_SETTLE_MS, LAUNCH_TIMEOUT_MS, MAX_CONCURRENCY, MAX_GUARDED_REQUESTS, MAX_QUEUE, QUEUE_TIMEOUT_MS, QUIET_PROGRESS_LOGS } from "./config.js";
 import { createDiagnosticsCollector } from "./diagnostics.js";
+import { buildToolFailure } from "./responses.js";
 import { browserContextOptions, buildCamoufoxOptions, validateCommonBrowserInput } from "./browser-options.js";
-import type { BrowserInstance, BrowserOperationContext, CamoufoxOptions, CommonBrowserInput, PendingBrowse, RequestGuard, SlotRelease } from "./types.js";
-import { applyStealthProfile, defaultHeadlessMode, describeError, getProxySecrets, getProxyServer, redactUrl, selectOperatingSystem, withTimeout } from "./utils.js";
+import type { BrowserInstance, BrowserOperationContext, CamoufoxOptions, CommonBrowserInput, PendingBrowse, RequestGuard, SlotRelease, WaitStrategy } from "./types.js";
+import { applyStealthProfile, defaultHeadlessMode, describeError, getProxySecrets, getProxyServer, isLoopbackNavigationError, redactUrl, selectOperatingSystem, withTimeout } from "./utils.js";
 
 export { browserContextOptions, buildCamoufoxOptions, validateBrowserOptionsInput } from "./browser-options.js";
 
@@ -73,6 +74,8 @@ export async function withBrowserSlot<T>(fn: () => Promise<T>): Promise<T> {
 }
 
 export async function launchCamoufoxBrowser(options: CamoufoxOptions): Promise<Browser> {
+  // Deferred so server startup and camoufox_status do not load the launcher and its fingerprint data.
+  const { Camoufox } = await import("camoufox-js");
   let timedOut = false;
   const launchPromise = Camoufox<undefined, Browser>(options as LaunchOptions);
   launchPromise.then(
@@ -198,7 +201,7 @@ export async function runBrowserOperation<T>(
     const waitStrategy = effectiveInput.waitStrategy ?? DEFAULT_WAIT_STRATEGY;
     const headlessMode = defaultHeadlessMode(effectiveInput.headless);
 
-    console.error(chalk.blue(`[Camoufox] Launching browser to ${label}: ${safeUrl}`));
+    if (!QUIET_PROGRESS_LOGS) console.error(chalk.blue(`[Camoufox] Launching browser to ${label}: ${safeUrl}`));
 
     const browser = await launchCamoufoxBrowser(buildCamoufoxOptions(effectiveInput, selectedOS, headlessMode));
     activeBrowsers.add(browser);
@@ -220,25 +223,11 @@ export async function runBrowserOperation<T>(
         }
       });
 
-      let response: Response | null;
-      try {
-        response = await page.goto(targetUrl.toString(), {
-          waitUntil: waitStrategy,
-          timeout: effectiveInput.timeout,
-        });
-        lastNavigationResponse = response;
-      } catch (navigationError) {
-        const navigationErrorMessage = describeError(navigationError).toLowerCase();
-        if (/\b(?:127\.0\.0\.1|localhost|ip6-localhost|ip6-loopback|::1)\b/.test(navigationErrorMessage)) {
-          throw new Error(`Blocked unsafe browser request to ${safeUrl}.`, { cause: navigationError });
-        }
-
-        requestGuard.assertAllowed();
-        throw navigationError;
-      }
-
+      const response = await navigatePage(page, requestGuard, targetUrl, safeUrl, waitStrategy, effectiveInput.timeout);
+      lastNavigationResponse = response;
       await page.waitForTimeout(GUARD_SETTLE_MS);
       requestGuard.assertAllowed();
+      // One-shot reads never start from about:blank, so unlike sessions they reject it.
       await validateTargetUrl(page.url());
       requestGuard.assertAllowed();
 
@@ -252,12 +241,24 @@ export async function runBrowserOperation<T>(
         getLastNavigationResponse: () => lastNavigationResponse,
       });
     } finally {
-      console.error(chalk.blue("[Camoufox] Closing browser."));
+      if (!QUIET_PROGRESS_LOGS) console.error(chalk.blue("[Camoufox] Closing browser."));
       await closeBrowser(browser);
     }
   });
 }
 
+export async function runBrowserTool<T>(
+  label: string,
+  input: CommonBrowserInput,
+  callback: (context: BrowserOperationContext) => Promise<T>,
+): Promise<T | ReturnType<typeof buildToolFailure>> {
+  try {
+    return await runBrowserOperation(label, input, callback);
+  } catch (error) {
+    return buildToolFailure(label, redactUrl(input.url), error, input);
+  }
+}
+
 export async function assertPageLocationSafe(page: Page): Promise<void> {
   if (page.url() === "about:blank") {
     return;
@@ -266,6 +267,29 @@ export async function assertPageLocationSafe(page: Page): Promise<void> {
   await validateTargetUrl(page.url());
 }
 
+export async function navigatePage(
+  page: Page,
+  requestGuard: RequestGuard,
+  targetUrl: URL,
+  safeUrl: string,
+  waitUntil: WaitStrategy,
+  timeout: number | undefined,
+  afterNavigation?: (response: Response | null) => Promise<void>,
+): Promise<Response | null> {
+  try {
+    const response = await page.goto(targetUrl.toString(), { waitUntil, timeout });
+    await afterNavigation?.(response);
+    return response;
+  } catch (navigationError) {
+    if (isLoopbackNavigationError(navigationError)) {
+      throw new Error(`Blocked unsafe browser request to ${safeUrl}.`, { cause: navigationError });
+    }
+
+    requestGuard.assertAllowed();
+    throw navigationError;
+  }
+}
+
 export async function settleAndAssertSafe(page: Page, requestGuard: RequestGuard): Promise<void> {
   await page.waitForTimeout(GUARD_SETTLE_MS);
   requestGuard.assertAllowed();
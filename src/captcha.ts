@@ -3,6 +3,7 @@ import { CAPTCHA_AUTONOMOUS } from "./config.js";
 import type { CaptchaDetection, CaptchaElementInfo, CaptchaIframeInfo, CaptchaPolicy, CaptchaProvider, ScreenshotResult } from "./types.js";
 import { redactUrl, truncateString } from "./utils.js";
 import { captureCaptchaScreenshot } from "./screenshots.js";
+import { buildSuccessContent } from "./responses.js";
 
 const CAPTCHA_STRATEGIES: Record<CaptchaProvider, string> = {
   recaptcha: "Use the returned iframe metadata and screenshot to guide manual reCAPTCHA completion, then resume the session.",
@@ -210,3 +211,18 @@ export async function maybeDetectCaptcha<T extends object>(
     : undefined;
   return { mergedPayload, captchaScreenshot };
 }
+
+export async function buildCaptchaAwareSuccess<T extends object>(
+  page: Page,
+  response: Response | null,
+  payload: T,
+  captchaPolicy: CaptchaPolicy | undefined,
+  safeUrl: string,
+  screenshotResult?: ScreenshotResult,
+) {
+  if (!captchaPolicy) {
+    return buildSuccessContent(payload, screenshotResult);
+  }
+  const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, captchaPolicy, safeUrl);
+  return buildSuccessContent(mergedPayload, screenshotResult ?? captchaScreenshot);
+}
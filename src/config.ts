@@ -19,6 +19,7 @@ export const ALLOW_EVALUATE = process.env.CAMOUFOX_MCP_ALLOW_EVALUATE === "1";
 export const CAPTCHA_AUTONOMOUS = process.env.CAPTCHA_AUTONOMOUS === "true";
 export const NETWORK_SANDBOX_DECLARED = process.env.CAMOUFOX_MCP_NETWORK_SANDBOX === "1";
 export const REQUIRE_NETWORK_SANDBOX = process.env.CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX === "1";
+export const QUIET_PROGRESS_LOGS = process.env.CAMOUFOX_MCP_QUIET === "1";
 
 export const SUPPORTED_OSES: readonly SupportedOs[] = ["windows", "macos", "linux"] as const;
 export const DENIED_BROWSER_ARG_FLAGS = new Set([
@@ -97,10 +98,16 @@ export function fileContains(path: string, value: string): boolean {
   }
 }
 
+let containerRuntimeDetected: boolean | undefined;
+
+// PID 1's cgroup and /.dockerenv cannot change for the life of the process.
 export function isLikelyContainerRuntime(): boolean {
-  return existsSync("/.dockerenv")
-    || fileContains("/proc/1/cgroup", "docker")
-    || fileContains("/proc/1/cgroup", "kubepods");
+  if (containerRuntimeDetected === undefined) {
+    containerRuntimeDetected = existsSync("/.dockerenv")
+      || fileContains("/proc/1/cgroup", "docker")
+      || fileContains("/proc/1/cgroup", "kubepods");
+  }
+  return containerRuntimeDetected;
 }
 
 export function detectNetworkSandboxMode(): NetworkSandboxMode {
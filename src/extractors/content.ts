@@ -279,10 +279,15 @@ export async function buildBrowsePayload(
   outputMode: OutputMode,
   maxChars: number,
   selector?: string,
+  titleRead: Promise<string> = page.title(),
 ): Promise<BrowsePayload> {
+  const [title, extracted] = await Promise.all([
+    titleRead,
+    outputMode === "metadata" ? undefined : extractPageContent(page, outputMode, maxChars, selector),
+  ]);
   const payload: BrowsePayload = {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     outputMode,
@@ -291,11 +296,10 @@ export async function buildBrowsePayload(
     selector,
   };
 
-  if (outputMode === "metadata") {
+  if (!extracted) {
     return payload;
   }
 
-  const extracted = await extractPageContent(page, outputMode, maxChars, selector);
   payload.truncated = extracted.truncated;
   payload.selectorFound = extracted.found;
 
@@ -10,7 +10,7 @@ export async function buildFindPayload(
   contextChars: number,
   selector?: string,
 ): Promise<FindPayload> {
-  const extracted = await page.evaluate(
+  const extraction = page.evaluate(
     (
       { searchQuery, maxItems, surroundingChars, cssSelector }: {
         searchQuery: string;
@@ -126,10 +126,11 @@ export async function buildFindPayload(
     },
     { searchQuery: query, maxItems: maxMatches, surroundingChars: contextChars, cssSelector: selector },
   );
+  const [extracted, title] = await Promise.all([extraction, page.title()]);
 
   return {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     query,
@@ -173,10 +173,10 @@ export async function buildFormsPayload(
   maxFields: number,
   selector?: string,
 ): Promise<FormsPayload> {
-  const extracted = await extractForms(page, maxForms, maxFields, selector);
+  const [extracted, title] = await Promise.all([extractForms(page, maxForms, maxFields, selector), page.title()]);
   return {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     selector,
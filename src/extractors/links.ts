@@ -112,10 +112,10 @@ export async function buildLinksPayload(
   maxLinks: number,
   selector?: string,
 ): Promise<LinksPayload> {
-  const extracted = await extractLinks(page, maxLinks, selector);
+  const [extracted, title] = await Promise.all([extractLinks(page, maxLinks, selector), page.title()]);
   return {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     selector,
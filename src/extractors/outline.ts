@@ -8,7 +8,7 @@ export async function buildOutlinePayload(
   maxItems: number,
   selector?: string,
 ): Promise<OutlinePayload> {
-  const extracted = await page.evaluate(
+  const extraction = page.evaluate(
     ({ maxOutlineItems, cssSelector }: { maxOutlineItems: number; cssSelector?: string }) => {
       const root = cssSelector
         ? document.querySelector(cssSelector)
@@ -90,10 +90,11 @@ export async function buildOutlinePayload(
     },
     { maxOutlineItems: maxItems, cssSelector: selector },
   );
+  const [extracted, title] = await Promise.all([extraction, page.title()]);
 
   return {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     description: extracted.description,
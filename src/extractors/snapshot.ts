@@ -189,12 +189,16 @@ export async function buildSnapshotPayload(
   maxChars: number,
   maxElements: number,
   selector?: string,
+  titleRead: Promise<string> = page.title(),
 ): Promise<SnapshotPayload> {
-  const text = await extractPageContent(page, "text", maxChars, selector);
-  const elementSnapshot = await extractSnapshotElements(page, maxElements, selector);
+  const [text, elementSnapshot, title] = await Promise.all([
+    extractPageContent(page, "text", maxChars, selector),
+    extractSnapshotElements(page, maxElements, selector),
+    titleRead,
+  ]);
   const payload: SnapshotPayload = {
     url: redactUrl(page.url()),
-    title: await page.title(),
+    title,
     status: response?.status(),
     contentType: response?.headers()["content-type"],
     selector,
@@ -1,10 +1,10 @@
-import { DEFAULT_MAX_ELEMENTS, MAX_SCREENSHOT_HEIGHT, MAX_SCREENSHOT_WIDTH } from "./config.js";
+import { DEFAULT_MAX_ELEMENTS } from "./config.js";
 import type { ConsoleToolInput, FindToolInput, FormsToolInput, LinksToolInput, NetworkSummaryToolInput, OutlineToolInput, ScreenshotToolInput } from "./schemas.js";
-import { runBrowserOperation, runGuardedPageRead } from "./browser-runtime.js";
-import { maybeDetectCaptcha } from "./captcha.js";
+import { runBrowserTool, runGuardedPageRead } from "./browser-runtime.js";
+import { buildCaptchaAwareSuccess } from "./captcha.js";
 import { buildFindPayload, buildFormsPayload, buildLinksPayload, buildNetworkSummary, buildOutlinePayload } from "./extractors.js";
-import { buildSuccessContent, buildToolError, buildToolFailure } from "./responses.js";
-import { captureScreenshot, isScreenshotDimensionAllowed } from "./screenshots.js";
+import { buildToolError } from "./responses.js";
+import { SCREENSHOT_DIMENSIONS_ERROR, captureScreenshot, isScreenshotDimensionAllowed } from "./screenshots.js";
 import { applyStealthProfile, redactUrl } from "./utils.js";
 import { appendDiagnostics } from "./diagnostics.js";
 
@@ -12,139 +12,107 @@ export async function handleLinks(input: LinksToolInput) {
   const effectiveInput = applyStealthProfile(input);
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse links", effectiveInput, async ({
+  return runBrowserTool("browse links", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
+      () => buildLinksPayload(
         page,
-        requestGuard,
-        () => buildLinksPayload(
-          page,
-          response,
-          effectiveInput.maxLinks ?? DEFAULT_MAX_ELEMENTS,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-      appendDiagnostics(payload, diagnostics.payload());
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse links", safeUrl, error, effectiveInput);
-  }
+        response,
+        effectiveInput.maxLinks ?? DEFAULT_MAX_ELEMENTS,
+        effectiveInput.selector,
+      ),
+    );
+    requestGuard.assertAllowed();
+    appendDiagnostics(payload, diagnostics.payload());
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleForms(input: FormsToolInput) {
   const effectiveInput = applyStealthProfile(input);
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse forms", effectiveInput, async ({
+  return runBrowserTool("browse forms", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
+      () => buildFormsPayload(
         page,
-        requestGuard,
-        () => buildFormsPayload(
-          page,
-          response,
-          effectiveInput.maxForms ?? 20,
-          effectiveInput.maxFields ?? DEFAULT_MAX_ELEMENTS,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-      appendDiagnostics(payload, diagnostics.payload());
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse forms", safeUrl, error, effectiveInput);
-  }
+        response,
+        effectiveInput.maxForms ?? 20,
+        effectiveInput.maxFields ?? DEFAULT_MAX_ELEMENTS,
+        effectiveInput.selector,
+      ),
+    );
+    requestGuard.assertAllowed();
+    appendDiagnostics(payload, diagnostics.payload());
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleOutline(input: OutlineToolInput) {
   const effectiveInput = applyStealthProfile(input);
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse outline", effectiveInput, async ({
+  return runBrowserTool("browse outline", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
+      () => buildOutlinePayload(
         page,
-        requestGuard,
-        () => buildOutlinePayload(
-          page,
-          response,
-          effectiveInput.maxItems ?? DEFAULT_MAX_ELEMENTS,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-      appendDiagnostics(payload, diagnostics.payload());
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse outline", safeUrl, error, effectiveInput);
-  }
+        response,
+        effectiveInput.maxItems ?? DEFAULT_MAX_ELEMENTS,
+        effectiveInput.selector,
+      ),
+    );
+    requestGuard.assertAllowed();
+    appendDiagnostics(payload, diagnostics.payload());
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleFind(input: FindToolInput) {
   const effectiveInput = applyStealthProfile(input);
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse find", effectiveInput, async ({
+  return runBrowserTool("browse find", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
+      () => buildFindPayload(
         page,
-        requestGuard,
-        () => buildFindPayload(
-          page,
-          response,
-          effectiveInput.query,
-          effectiveInput.maxMatches ?? 5,
-          effectiveInput.contextChars ?? 300,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-      appendDiagnostics(payload, diagnostics.payload());
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse find", safeUrl, error, effectiveInput);
-  }
+        response,
+        effectiveInput.query,
+        effectiveInput.maxMatches ?? 5,
+        effectiveInput.contextChars ?? 300,
+        effectiveInput.selector,
+      ),
+    );
+    requestGuard.assertAllowed();
+    appendDiagnostics(payload, diagnostics.payload());
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleScreenshot(input: ScreenshotToolInput) {
@@ -152,38 +120,30 @@ export async function handleScreenshot(input: ScreenshotToolInput) {
   const safeUrl = redactUrl(effectiveInput.url);
 
   if (!isScreenshotDimensionAllowed(effectiveInput.viewport, effectiveInput.window)) {
-    return buildToolError(`Screenshot dimensions exceed server policy (${MAX_SCREENSHOT_WIDTH}x${MAX_SCREENSHOT_HEIGHT}).`);
+    return buildToolError(SCREENSHOT_DIMENSIONS_ERROR);
   }
 
-  try {
-    return await runBrowserOperation("browse screenshot", effectiveInput, async ({
-      page,
-      response,
-      requestGuard,
-    }) => {
-      const screenshotResult = await captureScreenshot(page, safeUrl, {
-        fullPage: effectiveInput.fullPage,
-        selector: effectiveInput.selector,
-        type: effectiveInput.type,
-        quality: effectiveInput.quality,
-      });
-      requestGuard.assertAllowed();
-      const payload = {
-        url: redactUrl(page.url()),
-        title: await page.title(),
-        status: response?.status(),
-        contentType: response?.headers()["content-type"],
-        screenshot: screenshotResult.screenshotMetadata,
-      };
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, screenshotResult ?? captchaScreenshot);
-      }
-      return buildSuccessContent(payload, screenshotResult);
+  return runBrowserTool("browse screenshot", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+  }) => {
+    const screenshotResult = await captureScreenshot(page, safeUrl, {
+      fullPage: effectiveInput.fullPage,
+      selector: effectiveInput.selector,
+      type: effectiveInput.type,
+      quality: effectiveInput.quality,
     });
-  } catch (error) {
-    return buildToolFailure("browse screenshot", safeUrl, error, effectiveInput);
-  }
+    requestGuard.assertAllowed();
+    const payload = {
+      url: redactUrl(page.url()),
+      title: await page.title(),
+      status: response?.status(),
+      contentType: response?.headers()["content-type"],
+      screenshot: screenshotResult.screenshotMetadata,
+    };
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl, screenshotResult);
+  });
 }
 
 export async function handleConsole(input: ConsoleToolInput) {
@@ -194,32 +154,24 @@ export async function handleConsole(input: ConsoleToolInput) {
   });
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse console", effectiveInput, async ({
-      page,
-      response,
-      requestGuard,
-      diagnostics,
-    }) => {
-      await runGuardedPageRead(page, requestGuard, () => page.title());
-      requestGuard.assertAllowed();
-      const payload = {
-        url: redactUrl(page.url()),
-        title: await page.title(),
-        status: response?.status(),
-        contentType: response?.headers()["content-type"],
-        console: diagnostics.payload()?.console ?? [],
-        consoleTruncated: diagnostics.payload()?.consoleTruncated ?? false,
-      };
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse console", safeUrl, error, effectiveInput);
-  }
+  return runBrowserTool("browse console", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const title = await runGuardedPageRead(page, requestGuard, () => page.title());
+    requestGuard.assertAllowed();
+    const payload = {
+      url: redactUrl(page.url()),
+      title,
+      status: response?.status(),
+      contentType: response?.headers()["content-type"],
+      console: diagnostics.payload()?.console ?? [],
+      consoleTruncated: diagnostics.payload()?.consoleTruncated ?? false,
+    };
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleNetworkSummary(input: NetworkSummaryToolInput) {
@@ -230,26 +182,18 @@ export async function handleNetworkSummary(input: NetworkSummaryToolInput) {
   });
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse network summary", effectiveInput, async ({
+  return runBrowserTool("browse network summary", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
-        page,
-        requestGuard,
-        () => buildNetworkSummary(page, response, diagnostics.payload(), effectiveInput.maxFailures ?? 10),
-      );
-      requestGuard.assertAllowed();
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse network summary", safeUrl, error, effectiveInput);
-  }
+      () => buildNetworkSummary(page, response, diagnostics.payload(), effectiveInput.maxFailures ?? 10),
+    );
+    requestGuard.assertAllowed();
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
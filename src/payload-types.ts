@@ -140,6 +140,7 @@ export interface SequenceActionResult {
   index: number;
   type: string;
   selector?: string;
+  text?: string;
   status: "ok";
   result?: string;
   resultTruncated?: boolean;
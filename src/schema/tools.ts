@@ -109,10 +109,19 @@ export const sequenceActionSchema = z.discriminatedUnion("type", [
   z.object({
     type: z.literal("waitFor"),
     selector: z.string().max(2000).optional(),
+    text: z.string().min(1).max(2000).optional(),
     frame: frameSchema,
     state: z.enum(["attached", "detached", "visible", "hidden"]).optional().default("visible"),
     loadState: z.enum(["domcontentloaded", "load", "networkidle"]).optional(),
     timeout: actionTimeoutSchema,
+  }).superRefine((action, ctx) => {
+    if (action.text && action.state !== "visible" && action.state !== "attached") {
+      ctx.addIssue({
+        code: "custom",
+        path: ["state"],
+        message: "waitFor text supports only the visible and attached states.",
+      });
+    }
   }),
   z.object({
     type: z.literal("scroll"),
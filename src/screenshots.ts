@@ -1,9 +1,11 @@
 import type { Page } from "playwright-core";
 import chalk from "chalk";
-import { MAX_SCREENSHOT_AREA, MAX_SCREENSHOT_BYTES, MAX_SCREENSHOT_HEIGHT, MAX_SCREENSHOT_WIDTH } from "./config.js";
+import { MAX_SCREENSHOT_AREA, MAX_SCREENSHOT_BYTES, MAX_SCREENSHOT_HEIGHT, MAX_SCREENSHOT_WIDTH, QUIET_PROGRESS_LOGS } from "./config.js";
 import type { ScreenshotMetadata, ScreenshotOptions, ScreenshotResult, WindowSize } from "./types.js";
 import { describeError } from "./utils.js";
 
+export const SCREENSHOT_DIMENSIONS_ERROR = `Screenshot dimensions exceed server policy (${MAX_SCREENSHOT_WIDTH}x${MAX_SCREENSHOT_HEIGHT}).`;
+
 export function isScreenshotDimensionAllowed(viewport?: { width: number; height: number }, window?: WindowSize): boolean {
   const width = viewport?.width ?? window?.[0] ?? MAX_SCREENSHOT_WIDTH;
   const height = viewport?.height ?? window?.[1] ?? MAX_SCREENSHOT_HEIGHT;
@@ -47,16 +49,10 @@ export async function captureScreenshot(page: Page, safeUrl: string, options?: S
   try {
     let buffer: Buffer;
     if (options?.selector) {
-      const locator = page.locator(options.selector).first();
-      const count = await locator.count();
-      if (count === 0) {
-        screenshotMetadata.selectorFound = false;
-        screenshotMetadata.error = "Screenshot selector was not found.";
-        return { screenshotMetadata, mimeType };
-      }
-
-      screenshotMetadata.selectorFound = true;
-      const clip = await locator.evaluate((element) => {
+      // One round trip both checks for a match and measures the first one.
+      const clip = await page.locator(options.selector).evaluateAll((elements) => {
+        const element = elements[0];
+        if (!element) return undefined;
         element.scrollIntoView({ block: "center", inline: "center" });
         const rect = element.getBoundingClientRect();
         return {
@@ -67,6 +63,13 @@ export async function captureScreenshot(page: Page, safeUrl: string, options?: S
         };
       });
 
+      if (!clip) {
+        screenshotMetadata.selectorFound = false;
+        screenshotMetadata.error = "Screenshot selector was not found.";
+        return { screenshotMetadata, mimeType };
+      }
+
+      screenshotMetadata.selectorFound = true;
       if (clip.width <= 0 || clip.height <= 0) {
         screenshotMetadata.error = "Screenshot selector has no visible area.";
         return { screenshotMetadata, mimeType };
@@ -122,7 +125,7 @@ export async function captureScreenshot(page: Page, safeUrl: string, options?: S
       return { screenshotMetadata, mimeType };
     }
 
-    console.error(chalk.green(`[Camoufox] Screenshot captured for ${safeUrl}.`));
+    if (!QUIET_PROGRESS_LOGS) console.error(chalk.green(`[Camoufox] Screenshot captured for ${safeUrl}.`));
     return {
       screenshotMetadata: {
         ...screenshotMetadata,
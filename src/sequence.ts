@@ -6,10 +6,18 @@ import type { ClickMode, RequestGuard, SequenceActionResult } from "./types.js";
 import { describeError, serializeBounded, withTimeout } from "./utils.js";
 import { settleAndAssertSafe } from "./browser-runtime.js";
 
+export const EVALUATE_DISABLED_ERROR = "Evaluate action is disabled by server policy. Set CAMOUFOX_MCP_ALLOW_EVALUATE=1 to enable it.";
+export const SEQUENCE_BUDGET_ERROR = `Sequence timeout budget exceeds server policy (${SEQUENCE_TIMEOUT_MS}ms).`;
+
 export function actionTimeout(action: { timeout?: number }): number {
   return action.timeout ?? DEFAULT_ACTION_TIMEOUT_MS;
 }
 
+// Durations use the monotonic clock so wall-clock adjustments cannot skew them.
+function elapsedMs(started: number): number {
+  return Math.round(performance.now() - started);
+}
+
 export function sequenceTimeoutBudget(actions: SequenceAction[]): number {
   return actions.reduce((total, action) => total + actionTimeout(action), 0);
 }
@@ -81,32 +89,32 @@ export async function runSequenceAction(
   rawUrls: string[],
   secrets: string[],
 ): Promise<SequenceActionResult> {
-  const started = Date.now();
+  const started = performance.now();
   const timeout = actionTimeout(action);
 
   switch (action.type) {
     case "click":
       await activateElement(page, action.selector, timeout, action.frame, action.clickMode);
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "hover":
       await resolveLocator(page, action.selector, action.frame).hover({ timeout });
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "fill":
       await resolveLocator(page, action.selector, action.frame).fill(action.value, { timeout });
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "type":
       await resolveLocator(page, action.selector, action.frame).pressSequentially(action.text, {
         delay: action.delay,
         timeout,
       });
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "select":
       await resolveLocator(page, action.selector, action.frame).selectOption(action.value, { timeout });
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "press":
       if (action.selector) {
@@ -114,19 +122,21 @@ export async function runSequenceAction(
       } else {
         await withTimeout(page.keyboard.press(action.key), timeout, "Press action");
       }
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "waitFor":
-      if (action.selector) {
-        if (action.frame) {
-          await resolveLocator(page, action.selector, action.frame).waitFor({ state: action.state, timeout });
-        } else {
-          await page.waitForSelector(action.selector, { state: action.state, timeout });
-        }
+      if (action.text) {
+        // With both selector and text, one locator race resolves on whichever appears first.
+        const scope = action.frame ? page.frameLocator(action.frame) : page;
+        const textLocator = scope.getByText(action.text);
+        const locator = action.selector ? scope.locator(action.selector).or(textLocator) : textLocator;
+        await locator.first().waitFor({ state: action.state, timeout });
+      } else if (action.selector) {
+        await resolveLocator(page, action.selector, action.frame).waitFor({ state: action.state, timeout });
       } else {
         await page.waitForLoadState(action.loadState ?? "load", { timeout });
       }
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, text: action.text, status: "ok", durationMs: elapsedMs(started) };
 
     case "scroll":
       if (action.selector) {
@@ -161,11 +171,11 @@ export async function runSequenceAction(
       } else {
         await page.mouse.wheel(action.deltaX, action.deltaY);
       }
-      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: Date.now() - started };
+      return { index, type: action.type, selector: action.selector, status: "ok", durationMs: elapsedMs(started) };
 
     case "evaluate": {
       if (!ALLOW_EVALUATE) {
-        throw new Error("Evaluate action is disabled by server policy. Set CAMOUFOX_MCP_ALLOW_EVALUATE=1 to enable it.");
+        throw new Error(EVALUATE_DISABLED_ERROR);
       }
 
       const result = await withTimeout(
@@ -180,7 +190,7 @@ export async function runSequenceAction(
         status: "ok",
         result: serialized.value,
         resultTruncated: serialized.truncated,
-        durationMs: Date.now() - started,
+        durationMs: elapsedMs(started),
       };
     }
   }
@@ -2,19 +2,20 @@ import { randomUUID } from "node:crypto";
 import type { Browser, Response } from "playwright-core";
 import chalk from "chalk";
 import { validateTargetUrl } from "./policy.js";
-import { DEFAULT_ACTION_TIMEOUT_MS, DEFAULT_MAX_CHARS, DEFAULT_MAX_ELEMENTS, DEFAULT_WAIT_STRATEGY, MAX_SESSIONS, SESSION_CLOSE_GRACE_MS, SESSION_TTL_MS } from "./config.js";
+import { DEFAULT_ACTION_TIMEOUT_MS, DEFAULT_MAX_CHARS, DEFAULT_MAX_ELEMENTS, DEFAULT_WAIT_STRATEGY, MAX_SESSIONS, QUIET_PROGRESS_LOGS, SESSION_CLOSE_GRACE_MS, SESSION_TTL_MS } from "./config.js";
 import type { SessionRecord, SlotRelease, WaitStrategy } from "./types.js";
 import type { SessionActionToolInput, SessionCloseToolInput, SessionNavigateToolInput, SessionResumeToolInput, SessionSnapshotToolInput, SessionStartToolInput } from "./schemas.js";
-import { acquireBrowserSlot, browserContextOptions, buildCamoufoxOptions, closeBrowser, installRequestGuard, launchCamoufoxBrowser, runGuardedPageRead, settleAndAssertSafe, trackBrowser, validateBrowserOptionsInput } from "./browser-runtime.js";
+import { acquireBrowserSlot, browserContextOptions, buildCamoufoxOptions, closeBrowser, installRequestGuard, launchCamoufoxBrowser, navigatePage, runGuardedPageRead, settleAndAssertSafe, trackBrowser, validateBrowserOptionsInput } from "./browser-runtime.js";
 import { createDiagnosticsCollector } from "./diagnostics.js";
 import { buildBrowsePayload, buildSnapshotPayload } from "./extractors.js";
-import { maybeDetectCaptcha } from "./captcha.js";
+import { buildCaptchaAwareSuccess } from "./captcha.js";
 import { buildSuccessContent, buildToolError } from "./responses.js";
 import { isLocalOperationTimeout, runSequenceAction } from "./sequence.js";
 import { applyStealthProfile, defaultHeadlessMode, describeError, getProxySecrets, getProxyServer, redactUrl, sanitizeErrorMessage, selectOperatingSystem } from "./utils.js";
 
 let reservedSessions = 0;
 const sessions = new Map<string, SessionRecord>();
+const TOO_MANY_SESSIONS_ERROR = `Too many active sessions. Maximum is ${MAX_SESSIONS}.`;
 
 export function activeSessionCount(): number { return sessions.size; }
 
@@ -43,16 +44,20 @@ export function releaseSessionSlot(): void {
   reservedSessions = Math.max(0, reservedSessions - 1);
 }
 
+function detachSession(session: SessionRecord): void {
+  session.closing = true;
+  sessions.delete(session.id);
+  clearTimeout(session.timer);
+}
+
 export async function closeSessionNow(session: SessionRecord, reason: string): Promise<boolean> {
   if (session.closed) {
     return false;
   }
 
-  session.closing = true;
+  detachSession(session);
   session.closed = true;
-  sessions.delete(session.id);
-  clearTimeout(session.timer);
-  console.error(chalk.blue(`[Camoufox] Closing session ${session.id} (${reason}).`));
+  if (!QUIET_PROGRESS_LOGS) console.error(chalk.blue(`[Camoufox] Closing session ${session.id} (${reason}).`));
   try {
     await closeBrowser(session.browser);
   } finally {
@@ -68,9 +73,7 @@ export async function closeSession(sessionId: string, reason: string): Promise<b
     return false;
   }
 
-  session.closing = true;
-  sessions.delete(sessionId);
-  clearTimeout(session.timer);
+  detachSession(session);
   await waitForSessionOperationCloseGrace(session);
   return closeSessionNow(session, reason);
 }
@@ -140,27 +143,22 @@ export async function navigateSession(
   waitStrategy?: WaitStrategy,
   timeout?: number,
 ): Promise<Response | null> {
-  const safeUrl = redactUrl(url);
   const targetUrl = await validateTargetUrl(url);
   session.rawUrls.push(url);
 
-  try {
-    const response = await session.page.goto(targetUrl.toString(), {
-      waitUntil: waitStrategy ?? session.waitStrategy,
-      timeout: timeout ?? DEFAULT_ACTION_TIMEOUT_MS * 6,
-    });
-    session.lastNavigationResponse = response;
-    await settleAndAssertSafe(session.page, session.requestGuard);
-    return response;
-  } catch (navigationError) {
-    const navigationErrorMessage = describeError(navigationError).toLowerCase();
-    if (/\b(?:127\.0\.0\.1|localhost|ip6-localhost|ip6-loopback|::1)\b/.test(navigationErrorMessage)) {
-      throw new Error(`Blocked unsafe browser request to ${safeUrl}.`, { cause: navigationError });
-    }
-
-    session.requestGuard.assertAllowed();
-    throw navigationError;
-  }
+  // Settle inside navigatePage so settle-time loopback failures map to the blocked-request error.
+  return navigatePage(
+    session.page,
+    session.requestGuard,
+    targetUrl,
+    redactUrl(url),
+    waitStrategy ?? session.waitStrategy,
+    timeout ?? DEFAULT_ACTION_TIMEOUT_MS * 6,
+    async (response) => {
+      session.lastNavigationResponse = response;
+      await settleAndAssertSafe(session.page, session.requestGuard);
+    },
+  );
 }
 
 export async function handleSessionStart(input: SessionStartToolInput) {
@@ -170,7 +168,7 @@ export async function handleSessionStart(input: SessionStartToolInput) {
   });
 
   if (!reserveSessionSlot()) {
-    return buildToolError(`Too many active sessions. Maximum is ${MAX_SESSIONS}.`);
+    return buildToolError(TOO_MANY_SESSIONS_ERROR);
   }
 
   let release: SlotRelease | undefined;
@@ -252,6 +250,22 @@ export function sessionSanitizedError(error: unknown, session?: SessionRecord, e
   return sanitizeErrorMessage(describeError(error), rawUrls, secrets);
 }
 
+export async function runSessionTool<T>(
+  sessionId: string,
+  label: string,
+  operation: (session: SessionRecord) => Promise<T>,
+  extraRawUrls: string[] = [],
+): Promise<T | ReturnType<typeof buildToolError>> {
+  let session: SessionRecord | undefined;
+  try {
+    const currentSession = await getSession(sessionId);
+    session = currentSession;
+    return await runSessionExclusive(currentSession, () => operation(currentSession));
+  } catch (error) {
+    return buildToolError(`Failed to ${label}. Error: ${sessionSanitizedError(error, session, extraRawUrls)}`);
+  }
+}
+
 export async function buildSessionSnapshotResult(
   session: SessionRecord,
   input: SessionSnapshotToolInput,
@@ -268,102 +282,62 @@ export async function buildSessionSnapshotResult(
     ),
   );
   const basePayload = { sessionId: session.id, expiresAt: sessionExpiresAt(session), ...snapshot };
-  if (input.captchaPolicy) {
-    const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(
-      session.page,
-      session.lastNavigationResponse,
-      basePayload,
-      input.captchaPolicy,
-      redactUrl(session.page.url()),
-    );
-    return buildSuccessContent(mergedPayload, captchaScreenshot);
-  }
-  return buildSuccessContent(basePayload);
+  return buildCaptchaAwareSuccess(
+    session.page,
+    session.lastNavigationResponse,
+    basePayload,
+    input.captchaPolicy,
+    redactUrl(session.page.url()),
+  );
 }
 
 export async function handleSessionNavigate(input: SessionNavigateToolInput) {
-  let session: SessionRecord | undefined;
-  try {
-    const currentSession = await getSession(input.sessionId);
-    session = currentSession;
-    return await runSessionExclusive(currentSession, async () => {
-      const response = await navigateSession(currentSession, input.url, input.waitStrategy, input.timeout);
-      const mode = input.outputMode ?? "text";
-      const charLimit = input.maxChars ?? DEFAULT_MAX_CHARS;
-      const payload = await runGuardedPageRead(
-        currentSession.page,
-        currentSession.requestGuard,
-        () => buildBrowsePayload(currentSession.page, response, mode, charLimit, input.selector),
-      );
-      const basePayload = { sessionId: currentSession.id, expiresAt: sessionExpiresAt(currentSession), ...payload };
-      if (input.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(currentSession.page, response, basePayload, input.captchaPolicy, redactUrl(input.url));
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(basePayload);
-    });
-  } catch (error) {
-    return buildToolError(`Failed to navigate session. Error: ${sessionSanitizedError(error, session, [input.url])}`);
-  }
+  return runSessionTool(input.sessionId, "navigate session", async (currentSession) => {
+    const response = await navigateSession(currentSession, input.url, input.waitStrategy, input.timeout);
+    const mode = input.outputMode ?? "text";
+    const charLimit = input.maxChars ?? DEFAULT_MAX_CHARS;
+    const payload = await runGuardedPageRead(
+      currentSession.page,
+      currentSession.requestGuard,
+      () => buildBrowsePayload(currentSession.page, response, mode, charLimit, input.selector),
+    );
+    const basePayload = { sessionId: currentSession.id, expiresAt: sessionExpiresAt(currentSession), ...payload };
+    return buildCaptchaAwareSuccess(currentSession.page, response, basePayload, input.captchaPolicy, redactUrl(input.url));
+  }, [input.url]);
 }
 
 export async function handleSessionAction(input: SessionActionToolInput) {
-  let session: SessionRecord | undefined;
-  try {
-    const currentSession = await getSession(input.sessionId);
-    session = currentSession;
-    return await runSessionExclusive(currentSession, async () => {
-      const actionResult = await runSequenceAction(currentSession.page, input.action, 0, currentSession.rawUrls, currentSession.secrets);
-      await settleAndAssertSafe(currentSession.page, currentSession.requestGuard);
-      const snapshot = await runGuardedPageRead(
+  return runSessionTool(input.sessionId, "run session action", async (currentSession) => {
+    const actionResult = await runSequenceAction(currentSession.page, input.action, 0, currentSession.rawUrls, currentSession.secrets);
+    await settleAndAssertSafe(currentSession.page, currentSession.requestGuard);
+    const snapshot = await runGuardedPageRead(
+      currentSession.page,
+      currentSession.requestGuard,
+      () => buildSnapshotPayload(
         currentSession.page,
-        currentSession.requestGuard,
-        () => buildSnapshotPayload(
-          currentSession.page,
-          currentSession.lastNavigationResponse,
-          input.maxChars ?? DEFAULT_MAX_CHARS,
-          input.maxElements ?? DEFAULT_MAX_ELEMENTS,
-          input.selector,
-        ),
-      );
-      const basePayload = { sessionId: currentSession.id, expiresAt: sessionExpiresAt(currentSession), action: actionResult, snapshot };
-      if (input.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(currentSession.page, currentSession.lastNavigationResponse, basePayload, input.captchaPolicy, redactUrl(currentSession.page.url()));
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(basePayload);
-    });
-  } catch (error) {
-    return buildToolError(`Failed to run session action. Error: ${sessionSanitizedError(error, session)}`);
-  }
+        currentSession.lastNavigationResponse,
+        input.maxChars ?? DEFAULT_MAX_CHARS,
+        input.maxElements ?? DEFAULT_MAX_ELEMENTS,
+        input.selector,
+      ),
+    );
+    const basePayload = { sessionId: currentSession.id, expiresAt: sessionExpiresAt(currentSession), action: actionResult, snapshot };
+    return buildCaptchaAwareSuccess(currentSession.page, currentSession.lastNavigationResponse, basePayload, input.captchaPolicy, redactUrl(currentSession.page.url()));
+  });
 }
 
 export async function handleSessionSnapshot(input: SessionSnapshotToolInput) {
-  let session: SessionRecord | undefined;
-  try {
-    const currentSession = await getSession(input.sessionId);
-    session = currentSession;
-    return await runSessionExclusive(currentSession, async () => buildSessionSnapshotResult(currentSession, input));
-  } catch (error) {
-    return buildToolError(`Failed to snapshot session. Error: ${sessionSanitizedError(error, session)}`);
-  }
+  return runSessionTool(input.sessionId, "snapshot session", async (currentSession) => buildSessionSnapshotResult(currentSession, input));
 }
 
 export async function handleSessionResume(input: SessionResumeToolInput) {
-  let session: SessionRecord | undefined;
-  try {
-    const currentSession = await getSession(input.sessionId);
-    session = currentSession;
-    return await runSessionExclusive(currentSession, async () => {
-      if (input.waitStrategy) {
-        await currentSession.page.waitForLoadState(input.waitStrategy, { timeout: input.timeout ?? DEFAULT_ACTION_TIMEOUT_MS });
-        await settleAndAssertSafe(currentSession.page, currentSession.requestGuard);
-      }
-      return buildSessionSnapshotResult(currentSession, input);
-    });
-  } catch (error) {
-    return buildToolError(`Failed to resume session. Error: ${sessionSanitizedError(error, session)}`);
-  }
+  return runSessionTool(input.sessionId, "resume session", async (currentSession) => {
+    if (input.waitStrategy) {
+      await currentSession.page.waitForLoadState(input.waitStrategy, { timeout: input.timeout ?? DEFAULT_ACTION_TIMEOUT_MS });
+      await settleAndAssertSafe(currentSession.page, currentSession.requestGuard);
+    }
+    return buildSessionSnapshotResult(currentSession, input);
+  });
 }
 
 export async function handleSessionClose(input: SessionCloseToolInput) {
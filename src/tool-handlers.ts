@@ -1,15 +1,14 @@
-import { launchPath } from "camoufox-js/dist/pkgman.js";
 import chalk from "chalk";
-import { ALLOW_EVALUATE, ALLOW_UNSAFE_OPTIONS, CAPTCHA_AUTONOMOUS, DEFAULT_MAX_CHARS, DEFAULT_MAX_ELEMENTS, MAX_CONCURRENCY, MAX_QUEUE, MAX_SCREENSHOT_HEIGHT, MAX_SCREENSHOT_WIDTH, MAX_SESSIONS, SEQUENCE_TIMEOUT_MS, SERVER_VERSION, SESSION_TTL_MS, buildNetworkSecurityStatus } from "./config.js";
+import { ALLOW_EVALUATE, ALLOW_UNSAFE_OPTIONS, CAPTCHA_AUTONOMOUS, DEFAULT_MAX_CHARS, DEFAULT_MAX_ELEMENTS, MAX_CONCURRENCY, MAX_QUEUE, MAX_SESSIONS, QUIET_PROGRESS_LOGS, SEQUENCE_TIMEOUT_MS, SERVER_VERSION, SESSION_TTL_MS, buildNetworkSecurityStatus } from "./config.js";
 import type { BrowsePayload, OutputMode, ScreenshotResult, SequencePayload, StatusPayload, SupportedOs } from "./types.js";
 import type { BrowseToolInput, SequenceToolInput, SnapshotToolInput } from "./schemas.js";
-import { activeBrowserCount, queuedBrowserRequestCount, runBrowserOperation, runGuardedPageRead } from "./browser-runtime.js";
-import { maybeDetectCaptcha } from "./captcha.js";
+import { activeBrowserCount, queuedBrowserRequestCount, runBrowserTool, runGuardedPageRead } from "./browser-runtime.js";
+import { buildCaptchaAwareSuccess } from "./captcha.js";
 import { activeSessionCount } from "./sessions.js";
 import { buildBrowsePayload, buildSnapshotPayload } from "./extractors.js";
-import { buildSuccessContent, buildToolError, buildToolFailure } from "./responses.js";
-import { captureScreenshot, isScreenshotDimensionAllowed } from "./screenshots.js";
-import { runSequenceActionsWithBudget, sequenceTimeoutBudget } from "./sequence.js";
+import { buildSuccessContent, buildToolError } from "./responses.js";
+import { SCREENSHOT_DIMENSIONS_ERROR, captureScreenshot, isScreenshotDimensionAllowed } from "./screenshots.js";
+import { SEQUENCE_BUDGET_ERROR, runSequenceActionsWithBudget, sequenceTimeoutBudget } from "./sequence.js";
 import { applyStealthProfile, defaultHeadlessMode, getProxySecrets, getProxyServer, redactUrl } from "./utils.js";
 import { appendDiagnostics } from "./diagnostics.js";
 
@@ -51,15 +50,24 @@ export function isBlockedNavigationResponse(payload: BrowsePayload): boolean {
   return content.includes("forbidden redirect url") || content.includes("blocked redirect");
 }
 
-export function buildStatusPayload(): StatusPayload {
-  let browserAvailable: boolean;
-  let browserPath: string | undefined;
+// Only a found browser is cached, so a later `camoufox-js fetch` is still picked up.
+let resolvedBrowserPath: string | undefined;
+
+async function resolveBrowserPath(): Promise<string | undefined> {
+  if (resolvedBrowserPath) return resolvedBrowserPath;
   try {
-    browserPath = String(launchPath());
-    browserAvailable = true;
+    // Loaded on demand so server startup does not pay for camoufox-js's package manager.
+    const { launchPath } = await import("camoufox-js/dist/pkgman.js");
+    resolvedBrowserPath = String(launchPath());
   } catch {
-    browserAvailable = false;
+    return undefined;
   }
+  return resolvedBrowserPath;
+}
+
+export async function buildStatusPayload(): Promise<StatusPayload> {
+  const browserPath = await resolveBrowserPath();
+  const browserAvailable = browserPath !== undefined;
 
   return {
     version: SERVER_VERSION,
@@ -83,7 +91,7 @@ export function buildStatusPayload(): StatusPayload {
 }
 
 export async function handleStatus() {
-  return buildSuccessContent(buildStatusPayload());
+  return buildSuccessContent(await buildStatusPayload());
 }
 
 export async function handleBrowse(input: BrowseToolInput) {
@@ -91,39 +99,39 @@ export async function handleBrowse(input: BrowseToolInput) {
   const safeUrl = redactUrl(effectiveInput.url);
 
   if (effectiveInput.screenshot && !isScreenshotDimensionAllowed(effectiveInput.viewport, effectiveInput.window)) {
-    return buildToolError(`Screenshot dimensions exceed server policy (${MAX_SCREENSHOT_WIDTH}x${MAX_SCREENSHOT_HEIGHT}).`);
+    return buildToolError(SCREENSHOT_DIMENSIONS_ERROR);
   }
 
-  try {
-    return await runBrowserOperation("browse", effectiveInput, async ({
+  return runBrowserTool("browse", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+    selectedOS,
+    waitStrategy,
+  }) => {
+    const mode = effectiveInput.outputMode ?? "text";
+    const charLimit = effectiveInput.maxChars ?? DEFAULT_MAX_CHARS;
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-      selectedOS,
-      waitStrategy,
-    }) => {
-      const mode = effectiveInput.outputMode ?? "text";
-      const charLimit = effectiveInput.maxChars ?? DEFAULT_MAX_CHARS;
-      const payload = await runGuardedPageRead(
-        page,
-        requestGuard,
-        () => buildBrowsePayload(page, response, mode, charLimit, effectiveInput.selector),
-      );
-      requestGuard.assertAllowed();
-      if (isBlockedNavigationResponse(payload)) {
-        return buildToolError(`Blocked unsafe browser request to ${safeUrl}.`);
-      }
+      () => buildBrowsePayload(page, response, mode, charLimit, effectiveInput.selector),
+    );
+    requestGuard.assertAllowed();
+    if (isBlockedNavigationResponse(payload)) {
+      return buildToolError(`Blocked unsafe browser request to ${safeUrl}.`);
+    }
 
-      appendDiagnostics(payload, diagnostics.payload());
+    appendDiagnostics(payload, diagnostics.payload());
 
-      let screenshotResult: ScreenshotResult | undefined;
-      if (effectiveInput.screenshot) {
-        screenshotResult = await captureScreenshot(page, safeUrl, effectiveInput.screenshotOptions);
-        payload.screenshot = screenshotResult.screenshotMetadata;
-      }
-      requestGuard.assertAllowed();
+    let screenshotResult: ScreenshotResult | undefined;
+    if (effectiveInput.screenshot) {
+      screenshotResult = await captureScreenshot(page, safeUrl, effectiveInput.screenshotOptions);
+      payload.screenshot = screenshotResult.screenshotMetadata;
+    }
+    requestGuard.assertAllowed();
 
+    if (!QUIET_PROGRESS_LOGS) {
       const features = buildFeatureSummary(
         selectedOS,
         waitStrategy,
@@ -138,53 +146,39 @@ export async function handleBrowse(input: BrowseToolInput) {
         effectiveInput.geoip,
       );
       console.error(chalk.green(`[Camoufox] Successfully retrieved content from ${safeUrl} (${features}).`));
+    }
 
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, screenshotResult ?? captchaScreenshot);
-      }
-      return buildSuccessContent(payload, screenshotResult);
-    });
-  } catch (error) {
-    return buildToolFailure("browse", safeUrl, error, effectiveInput);
-  }
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl, screenshotResult);
+  });
 }
 
 export async function handleSnapshot(input: SnapshotToolInput) {
   const effectiveInput = applyStealthProfile(input);
   const safeUrl = redactUrl(effectiveInput.url);
 
-  try {
-    return await runBrowserOperation("browse snapshot", effectiveInput, async ({
+  return runBrowserTool("browse snapshot", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+  }) => {
+    const payload = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-    }) => {
-      const payload = await runGuardedPageRead(
+      () => buildSnapshotPayload(
         page,
-        requestGuard,
-        () => buildSnapshotPayload(
-          page,
-          response,
-          effectiveInput.maxChars ?? DEFAULT_MAX_CHARS,
-          effectiveInput.maxElements ?? DEFAULT_MAX_ELEMENTS,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-      appendDiagnostics(payload, diagnostics.payload());
-      console.error(chalk.green(`[Camoufox] Successfully captured snapshot from ${safeUrl}.`));
+        response,
+        effectiveInput.maxChars ?? DEFAULT_MAX_CHARS,
+        effectiveInput.maxElements ?? DEFAULT_MAX_ELEMENTS,
+        effectiveInput.selector,
+      ),
+    );
+    requestGuard.assertAllowed();
+    appendDiagnostics(payload, diagnostics.payload());
+    if (!QUIET_PROGRESS_LOGS) console.error(chalk.green(`[Camoufox] Successfully captured snapshot from ${safeUrl}.`));
 
-      if (effectiveInput.captchaPolicy) {
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, captchaScreenshot);
-      }
-      return buildSuccessContent(payload);
-    });
-  } catch (error) {
-    return buildToolFailure("browse snapshot", safeUrl, error, effectiveInput);
-  }
+    return buildCaptchaAwareSuccess(page, response, payload, effectiveInput.captchaPolicy, safeUrl);
+  });
 }
 
 export async function handleSequence(input: SequenceToolInput) {
@@ -192,88 +186,80 @@ export async function handleSequence(input: SequenceToolInput) {
   const safeUrl = redactUrl(effectiveInput.url);
 
   if (effectiveInput.screenshot && !isScreenshotDimensionAllowed(effectiveInput.viewport, effectiveInput.window)) {
-    return buildToolError(`Screenshot dimensions exceed server policy (${MAX_SCREENSHOT_WIDTH}x${MAX_SCREENSHOT_HEIGHT}).`);
+    return buildToolError(SCREENSHOT_DIMENSIONS_ERROR);
   }
 
   if (sequenceTimeoutBudget(effectiveInput.actions) > SEQUENCE_TIMEOUT_MS) {
-    return buildToolError(`Sequence timeout budget exceeds server policy (${SEQUENCE_TIMEOUT_MS}ms).`);
+    return buildToolError(SEQUENCE_BUDGET_ERROR);
   }
 
-  try {
-    return await runBrowserOperation("browse sequence", effectiveInput, async ({
+  return runBrowserTool("browse sequence", effectiveInput, async ({
+    page,
+    response,
+    requestGuard,
+    diagnostics,
+    getLastNavigationResponse,
+  }) => {
+    const rawUrls = [effectiveInput.url, getProxyServer(effectiveInput.proxy)].filter((rawUrl): rawUrl is string => Boolean(rawUrl));
+    const secrets = getProxySecrets(effectiveInput.proxy);
+    const actions = await runSequenceActionsWithBudget(page, requestGuard, effectiveInput.actions, rawUrls, secrets);
+
+    const mode = effectiveInput.outputMode ?? "text";
+    const charLimit = effectiveInput.maxChars ?? DEFAULT_MAX_CHARS;
+    const finalResponse = getLastNavigationResponse() ?? response;
+    // Both payloads share one guarded settle window and one title read.
+    const [contentPayload, snapshot] = await runGuardedPageRead(
       page,
-      response,
       requestGuard,
-      diagnostics,
-      getLastNavigationResponse,
-    }) => {
-      const rawUrls = [effectiveInput.url, getProxyServer(effectiveInput.proxy)].filter((rawUrl): rawUrl is string => Boolean(rawUrl));
-      const secrets = getProxySecrets(effectiveInput.proxy);
-      const actions = await runSequenceActionsWithBudget(page, requestGuard, effectiveInput.actions, rawUrls, secrets);
+      () => {
+        const titleRead = page.title();
+        return Promise.all([
+          buildBrowsePayload(page, finalResponse, mode, charLimit, effectiveInput.selector, titleRead),
+          buildSnapshotPayload(
+            page,
+            finalResponse,
+            charLimit,
+            effectiveInput.maxElements ?? DEFAULT_MAX_ELEMENTS,
+            effectiveInput.selector,
+            titleRead,
+          ),
+        ]);
+      },
+    );
+    requestGuard.assertAllowed();
+    if (isBlockedNavigationResponse(contentPayload)) {
+      return buildToolError(`Blocked unsafe browser request to ${safeUrl}.`);
+    }
 
-      const mode = effectiveInput.outputMode ?? "text";
-      const charLimit = effectiveInput.maxChars ?? DEFAULT_MAX_CHARS;
-      const finalResponse = getLastNavigationResponse() ?? response;
-      const contentPayload = await runGuardedPageRead(
-        page,
-        requestGuard,
-        () => buildBrowsePayload(page, finalResponse, mode, charLimit, effectiveInput.selector),
-      );
-      requestGuard.assertAllowed();
-      if (isBlockedNavigationResponse(contentPayload)) {
-        return buildToolError(`Blocked unsafe browser request to ${safeUrl}.`);
-      }
+    const payload: SequencePayload = {
+      url: contentPayload.url,
+      title: contentPayload.title,
+      status: contentPayload.status,
+      contentType: contentPayload.contentType,
+      initialStatus: response?.status(),
+      actions,
+      snapshot,
+      outputMode: mode,
+      truncated: contentPayload.truncated,
+      maxChars: charLimit,
+      selector: effectiveInput.selector,
+      selectorFound: contentPayload.selectorFound,
+      text: contentPayload.text,
+      html: contentPayload.html,
+    };
 
-      const snapshot = await runGuardedPageRead(
-        page,
-        requestGuard,
-        () => buildSnapshotPayload(
-          page,
-          finalResponse,
-          charLimit,
-          effectiveInput.maxElements ?? DEFAULT_MAX_ELEMENTS,
-          effectiveInput.selector,
-        ),
-      );
-      requestGuard.assertAllowed();
-
-      const payload: SequencePayload = {
-        url: contentPayload.url,
-        title: contentPayload.title,
-        status: contentPayload.status,
-        contentType: contentPayload.contentType,
-        initialStatus: response?.status(),
-        actions,
-        snapshot,
-        outputMode: mode,
-        truncated: contentPayload.truncated,
-        maxChars: charLimit,
-        selector: effectiveInput.selector,
-        selectorFound: contentPayload.selectorFound,
-        text: contentPayload.text,
-        html: contentPayload.html,
-      };
+    appendDiagnostics(payload, diagnostics.payload());
 
-      appendDiagnostics(payload, diagnostics.payload());
+    let screenshotResult: ScreenshotResult | undefined;
+    if (effectiveInput.screenshot) {
+      screenshotResult = await captureScreenshot(page, safeUrl, effectiveInput.screenshotOptions);
+      payload.screenshot = screenshotResult.screenshotMetadata;
+    }
+    requestGuard.assertAllowed();
 
-      let screenshotResult: ScreenshotResult | undefined;
-      if (effectiveInput.screenshot) {
-        screenshotResult = await captureScreenshot(page, safeUrl, effectiveInput.screenshotOptions);
-        payload.screenshot = screenshotResult.screenshotMetadata;
-      }
-      requestGuard.assertAllowed();
-
-      console.error(chalk.green(`[Camoufox] Successfully ran ${actions.length} actions from ${safeUrl}.`));
-      if (effectiveInput.captchaPolicy) {
-        const finalResponse = getLastNavigationResponse() ?? response;
-        const { mergedPayload, captchaScreenshot } = await maybeDetectCaptcha(page, finalResponse, payload, effectiveInput.captchaPolicy, safeUrl);
-        return buildSuccessContent(mergedPayload, screenshotResult ?? captchaScreenshot);
-      }
-      return buildSuccessContent(payload, screenshotResult);
-    });
-  } catch (error) {
-    return buildToolFailure("browse sequence", safeUrl, error, effectiveInput);
-  }
+    if (!QUIET_PROGRESS_LOGS) console.error(chalk.green(`[Camoufox] Successfully ran ${actions.length} actions from ${safeUrl}.`));
+    return buildCaptchaAwareSuccess(page, getLastNavigationResponse() ?? response, payload, effectiveInput.captchaPolicy, safeUrl, screenshotResult);
+  });
 }
 
 export {
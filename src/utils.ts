@@ -1,10 +1,18 @@
 import { DEFAULT_STEALTH_PROFILE, MAX_DIAGNOSTIC_TEXT_CHARS, SUPPORTED_OSES } from "./config.js";
 import type { BrowserLaunchInput, ProxyConfig, StealthProfile, SupportedOs } from "./types.js";
 
+const LOOPBACK_HOST_PATTERN = /\b(?:127\.0\.0\.1|localhost|ip6-localhost|ip6-loopback|::1)\b/i;
+const EMBEDDED_URL_PATTERN = /\bhttps?:\/\/[^\s"'<>]+/gi;
+const TRAILING_URL_PUNCTUATION_PATTERN = /[),.;\]]+$/;
+
 export function describeError(error: unknown): string {
   return error instanceof Error ? error.message : String(error);
 }
 
+export function isLoopbackNavigationError(error: unknown): boolean {
+  return LOOPBACK_HOST_PATTERN.test(describeError(error));
+}
+
 export async function withTimeout<T>(promise: Promise<T>, ms: number, label: string): Promise<T> {
   let timer: ReturnType<typeof setTimeout> | undefined;
   const timeout = new Promise<never>((_, reject) => {
@@ -44,34 +52,54 @@ export function getProxyServer(proxy?: ProxyConfig): string | undefined {
 }
 
 export function getProxySecrets(proxy?: ProxyConfig): string[] {
-  if (!proxy || typeof proxy === "string") {
+  if (!proxy) {
     return [];
   }
 
-  return [proxy.username, proxy.password].filter((secret): secret is string => Boolean(secret));
+  const secrets: Array<string | undefined> = typeof proxy === "string" ? [] : [proxy.username, proxy.password];
+  secrets.push(...proxyUrlCredentials(getProxyServer(proxy)));
+  return [...new Set(secrets.filter((secret): secret is string => Boolean(secret)))];
 }
 
-export function sanitizeErrorMessage(message: string, rawUrls: string[], secrets: string[] = []): string {
-  let sanitized = message;
+function proxyUrlCredentials(server: string | undefined): string[] {
+  if (!server) {
+    return [];
+  }
 
-  for (const secret of secrets) {
-    sanitized = sanitized.replaceAll(secret, "<redacted>");
+  try {
+    const url = new URL(server);
+    return [url.username, url.password].flatMap((credential) => [credential, safeDecodeURIComponent(credential)]);
+  } catch {
+    return [];
+  }
+}
+
+function safeDecodeURIComponent(value: string): string {
+  try {
+    return decodeURIComponent(value);
+  } catch {
+    return value;
   }
+}
+
+export function sanitizeErrorMessage(message: string, rawUrls: string[], secrets: string[] = []): string {
+  let sanitized = message;
 
+  // URLs go first: a secret replaced inside a URL would cut the URL match short and leave its query behind.
   for (const rawUrl of rawUrls) {
     sanitized = sanitized.replaceAll(rawUrl, redactUrl(rawUrl));
   }
 
-  return sanitized.replace(/\bhttps?:\/\/[^\s"'<>]+/gi, (matchedUrl) => {
-    let suffix = "";
-    let candidate = matchedUrl;
-    while (candidate.length > 0 && /[),.;\]]$/.test(candidate)) {
-      suffix = `${candidate[candidate.length - 1]}${suffix}`;
-      candidate = candidate.slice(0, -1);
-    }
-
-    return `${redactUrl(candidate)}${suffix}`;
+  sanitized = sanitized.replace(EMBEDDED_URL_PATTERN, (matchedUrl) => {
+    const suffix = TRAILING_URL_PUNCTUATION_PATTERN.exec(matchedUrl)?.[0] ?? "";
+    return `${redactUrl(matchedUrl.slice(0, matchedUrl.length - suffix.length))}${suffix}`;
   });
+
+  for (const secret of secrets) {
+    sanitized = sanitized.replaceAll(secret, "<redacted>");
+  }
+
+  return sanitized;
 }
 
 export function truncateString(value: string, maxChars: number): { value: string; truncated: boolean } {
@@ -113,43 +141,47 @@ export function defaultHeadlessMode(headless: boolean | "virtual" | undefined):
   return process.platform === "linux" ? "virtual" : true;
 }
 
+const BASE_LAUNCH_DEFAULTS: BrowserLaunchInput = {
+  humanize: true,
+  geoip: true,
+  block_webrtc: true,
+  block_images: false,
+  block_webgl: false,
+  disable_coop: false,
+  enable_cache: false,
+  includeConsole: false,
+  includeNetwork: false,
+};
+
+// Base defaults are merged into each profile once at load, so each call does a single spread.
+const STEALTH_PROFILE_DEFAULTS: Readonly<Record<StealthProfile, BrowserLaunchInput>> = {
+  normal: { ...BASE_LAUNCH_DEFAULTS },
+  privacy: {
+    ...BASE_LAUNCH_DEFAULTS,
+    block_webgl: true,
+  },
+  human_assisted: {
+    ...BASE_LAUNCH_DEFAULTS,
+    headless: false,
+    enable_cache: true,
+    captchaPolicy: "pause",
+  },
+  fast: {
+    ...BASE_LAUNCH_DEFAULTS,
+    block_images: true,
+    humanize: false,
+  },
+  debug: {
+    ...BASE_LAUNCH_DEFAULTS,
+    includeConsole: true,
+    includeNetwork: true,
+  },
+};
+
 export function applyStealthProfile<T extends BrowserLaunchInput>(input: T): T {
   const profile = input.stealthProfile ?? DEFAULT_STEALTH_PROFILE;
-  const defaults: BrowserLaunchInput = {
-    humanize: true,
-    geoip: true,
-    block_webrtc: true,
-    block_images: false,
-    block_webgl: false,
-    disable_coop: false,
-    enable_cache: false,
-    includeConsole: false,
-    includeNetwork: false,
-  };
-
-  const profileDefaults: Record<StealthProfile, BrowserLaunchInput> = {
-    normal: {},
-    privacy: {
-      block_webgl: true,
-    },
-    human_assisted: {
-      headless: false,
-      enable_cache: true,
-      captchaPolicy: "pause",
-    },
-    fast: {
-      block_images: true,
-      humanize: false,
-    },
-    debug: {
-      includeConsole: true,
-      includeNetwork: true,
-    },
-  };
-
   return {
-    ...defaults,
-    ...profileDefaults[profile],
+    ...STEALTH_PROFILE_DEFAULTS[profile],
     ...input,
     stealthProfile: profile,
   };
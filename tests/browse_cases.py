@@ -1,11 +1,35 @@
-import json
-import subprocess
-import threading
-import time
-
-from harness import MCPTestClient, TEST_ENV
+SCREENSHOT_TARGET_HTML = """<!doctype html>
+<html>
+<body>
+  <h1 style="display:inline-block;width:320px;height:80px;margin:0">Screenshot target</h1>
+</body>
+</html>"""
 
 class BrowseCases:
+    def _assert_screenshot_included(self, response, mime_type):
+        payload = self.get_tool_payload(response)
+        screenshot = payload.get("screenshot", {})
+        assert screenshot.get("included") is True, f"Expected included screenshot: {payload}"
+        assert screenshot.get("selectorFound") is True
+        content = response.get("result", {}).get("content", [])
+        assert len(content) == 2
+        assert content[1].get("mimeType") == mime_type
+        return screenshot
+
+    def _assert_screenshot_rejected(self, html, screenshot_options):
+        response = self._run_browse({
+            "url": self._fixture_url(html),
+            "screenshot": True,
+            "screenshotOptions": screenshot_options,
+            "maxChars": 1000
+        }, timeout=90)
+        payload = self.get_tool_payload(response)
+        screenshot = payload.get("screenshot", {})
+        assert screenshot.get("included") is False, f"Expected omitted screenshot: {payload}"
+        assert "dimension policy" in screenshot.get("error", ""), f"Expected dimension policy error: {payload}"
+        assert len(response.get("result", {}).get("content", [])) == 1
+        return screenshot
+
     def test_call_tool_browse_success(self):
         print("--- Running Test: Call Tool - Browse Success (No Window Param) ---")
         response = self._run_browse({"url": self._example_url()})
@@ -57,14 +81,8 @@ class BrowseCases:
 
     def test_call_tool_browse_selector_jpeg_screenshot(self):
         print("--- Running Test: Call Tool - Browse Selector JPEG Screenshot ---")
-        html = """<!doctype html>
-<html>
-<body>
-  <h1 style="display:inline-block;width:320px;height:80px;margin:0">Screenshot target</h1>
-</body>
-</html>"""
         response = self._run_browse({
-            "url": self._fixture_url(html),
+            "url": self._fixture_url(SCREENSHOT_TARGET_HTML),
             "selector": "h1",
             "screenshot": True,
             "screenshotOptions": {
@@ -73,14 +91,8 @@ class BrowseCases:
                 "quality": 60
             }
         })
-        payload = self.get_tool_payload(response)
-        screenshot = payload.get("screenshot", {})
-        assert screenshot.get("included") is True, f"Expected included screenshot: {payload}"
+        screenshot = self._assert_screenshot_included(response, "image/jpeg")
         assert screenshot.get("type") == "jpeg"
-        assert screenshot.get("selectorFound") is True
-        content = response.get("result", {}).get("content", [])
-        assert len(content) == 2
-        assert content[1].get("mimeType") == "image/jpeg"
         print("CallTool selector JPEG screenshot test passed.")
 
     def test_call_tool_focused_extractors(self):
@@ -132,24 +144,13 @@ class BrowseCases:
 
     def test_call_tool_screenshot_tool(self):
         print("--- Running Test: Call Tool - Screenshot Tool ---")
-        html = """<!doctype html>
-<html>
-<body>
-  <h1 style="display:inline-block;width:320px;height:80px;margin:0">Screenshot target</h1>
-</body>
-</html>"""
         response = self._run_screenshot({
-            "url": self._fixture_url(html),
+            "url": self._fixture_url(SCREENSHOT_TARGET_HTML),
             "selector": "h1",
             "type": "jpeg",
             "quality": 70
         })
-        payload = self.get_tool_payload(response)
-        assert payload["screenshot"]["included"] is True, f"Expected screenshot: {payload}"
-        assert payload["screenshot"]["selectorFound"] is True
-        content = response.get("result", {}).get("content", [])
-        assert len(content) == 2
-        assert content[1].get("mimeType") == "image/jpeg"
+        self._assert_screenshot_included(response, "image/jpeg")
         print("CallTool screenshot tool test passed.")
 
     def test_call_tool_console_and_network_summary(self):
@@ -180,19 +181,7 @@ class BrowseCases:
   <main style="height:3000px;width:100%;background:#eee">tall page</main>
 </body>
 </html>"""
-        response = self._run_browse({
-            "url": self._fixture_url(html),
-            "screenshot": True,
-            "screenshotOptions": {
-                "fullPage": True
-            },
-            "maxChars": 1000
-        }, timeout=90)
-        payload = self.get_tool_payload(response)
-        screenshot = payload.get("screenshot", {})
-        assert screenshot.get("included") is False, f"Expected omitted screenshot: {payload}"
-        assert "dimension policy" in screenshot.get("error", ""), f"Expected dimension policy error: {payload}"
-        assert len(response.get("result", {}).get("content", [])) == 1
+        self._assert_screenshot_rejected(html, {"fullPage": True})
         print("CallTool oversize full-page screenshot rejection test passed.")
 
     def test_call_tool_browse_rejects_oversize_selector_screenshot(self):
@@ -203,19 +192,8 @@ class BrowseCases:
   <div id="large" style="width:2200px;height:1200px;background:#ddd">large target</div>
 </body>
 </html>"""
-        response = self._run_browse({
-            "url": self._fixture_url(html),
-            "screenshot": True,
-            "screenshotOptions": {
-                "selector": "#large"
-            },
-            "maxChars": 1000
-        }, timeout=90)
-        payload = self.get_tool_payload(response)
-        screenshot = payload.get("screenshot", {})
-        assert screenshot.get("included") is False, f"Expected omitted screenshot: {payload}"
+        screenshot = self._assert_screenshot_rejected(html, {"selector": "#large"})
         assert screenshot.get("selectorFound") is True
-        assert "dimension policy" in screenshot.get("error", ""), f"Expected dimension policy error: {payload}"
         print("CallTool oversize selector screenshot rejection test passed.")
 
     def test_call_tool_browse_missing_selector(self):
@@ -1,11 +1,3 @@
-import json
-import subprocess
-import threading
-import time
-
-from harness import MCPTestClient, TEST_ENV
-
-
 class BrowseEdgeCases:
     def test_call_tool_browse_truncates_huge_text(self):
         print("--- Running Test: Call Tool - Truncate Huge Text ---")
@@ -71,8 +63,7 @@ class BrowseEdgeCases:
             "url": self._fixture_url(html),
             "timeout": 10000
         }, timeout=30)
-        assert response and response.get("result", {}).get("isError"), f"Private subresource was not rejected: {response}"
-        assert "blocked unsafe browser request" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "blocked unsafe browser request", f"Private subresource was not rejected: {response}")
         print("CallTool private subresource rejection test passed.")
 
     def test_call_tool_browse_rejects_private_websocket(self):
@@ -90,8 +81,7 @@ class BrowseEdgeCases:
             "url": self._fixture_url(html),
             "timeout": 10000
         }, timeout=30)
-        assert response and response.get("result", {}).get("isError"), f"Private WebSocket was not rejected: {response}"
-        assert "blocked unsafe browser request" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "blocked unsafe browser request", f"Private WebSocket was not rejected: {response}")
         print("CallTool private WebSocket rejection test passed.")
 
     def test_call_tool_browse_rejects_delayed_private_navigation(self):
@@ -106,18 +96,12 @@ class BrowseEdgeCases:
             "url": self._fixture_url(html),
             "timeout": 10000
         }, timeout=30)
-        assert response and response.get("result", {}).get("isError"), f"Delayed private navigation was not rejected: {response}"
-        assert "not allowed" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "not allowed", f"Delayed private navigation was not rejected: {response}")
         print("CallTool delayed private navigation rejection test passed.")
 
     def test_call_tool_browse_rejects_denylisted_unsafe_options_when_allowed(self):
         print("--- Running Test: Call Tool - Reject Denylisted Unsafe Options With Env Opt-In ---")
-        unsafe_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({"CAMOUFOX_MCP_ALLOW_UNSAFE_OPTIONS": "1"})
-        )
+        unsafe_client = self._variant_client(self._test_env({"CAMOUFOX_MCP_ALLOW_UNSAFE_OPTIONS": "1"}))
         try:
             unsafe_client.start_server()
             unsafe_client.test_handshake()
@@ -125,8 +109,7 @@ class BrowseEdgeCases:
                 "url": unsafe_client._example_url(),
                 "args": ["--remote-debugging-port", "0"]
             }, timeout=10)
-            assert response and response.get("result", {}).get("isError"), f"Denylisted unsafe option was not rejected: {response}"
-            assert "denied by server policy" in unsafe_client.get_tool_text(response).lower()
+            unsafe_client.assert_tool_error(response, "denied by server policy", f"Denylisted unsafe option was not rejected: {response}")
         finally:
             unsafe_client.stop_server()
         print("CallTool denylisted unsafe option rejection with env opt-in test passed.")
@@ -1,25 +1,51 @@
 import sys
 sys.dont_write_bytecode = True
 
+import collections
+import hashlib
+import itertools
 import json
 import os
 import subprocess
 import threading
 import time
+import types
 import urllib.parse
-import uuid
-import argparse
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
-TEST_ENV = {
+TEST_ENV = types.MappingProxyType({
     "NODE_ENV": "test",
     "CAMOUFOX_MCP_TEST_ALLOW_LOCALHOST": "1",
     "CAMOUFOX_MCP_NETWORK_SANDBOX": "0",
     "CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX": "0",
     "CAPTCHA_AUTONOMOUS": "false",
+})
+
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {
+        "name": "test-client",
+        "version": "1.0.0"
+    }
 }
 
+STDERR_HISTORY_LINES = 2000
+JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+EXAMPLE_HTML = b"""<!doctype html>
+<html>
+<head><title>Example Domain</title></head>
+<body>
+  <h1>Example Domain</h1>
+  <p>This domain is for use in illustrative examples in documents.</p>
+  <p><a href="/more">More information</a></p>
+</body>
+</html>"""
+SLOW_HTML = b"<!doctype html><html><body>slow fixture</body></html>"
+CAPTCHA_FRAME_HTML = b"<!doctype html><html><body>captcha frame</body></html>"
+
 
 class FixtureServer:
     def __init__(self, mode):
@@ -39,15 +65,7 @@ class FixtureServer:
             def do_GET(self):
                 parsed = urllib.parse.urlparse(self.path)
                 if parsed.path == "/example":
-                    self._send_html("""<!doctype html>
-<html>
-<head><title>Example Domain</title></head>
-<body>
-  <h1>Example Domain</h1>
-  <p>This domain is for use in illustrative examples in documents.</p>
-  <p><a href="/more">More information</a></p>
-</body>
-</html>""")
+                    self._send_html(EXAMPLE_HTML)
                     return
 
                 if parsed.path == "/redirect-to":
@@ -60,26 +78,25 @@ class FixtureServer:
                 if parsed.path == "/slow":
                     seconds = float(urllib.parse.parse_qs(parsed.query).get("seconds", ["6"])[0])
                     time.sleep(seconds)
-                    self._send_html("<!doctype html><html><body>slow fixture</body></html>")
+                    self._send_html(SLOW_HTML)
                     return
 
                 if parsed.path.startswith("/recaptcha/"):
-                    self._send_html("<!doctype html><html><body>captcha frame</body></html>")
+                    self._send_html(CAPTCHA_FRAME_HTML)
                     return
 
                 if parsed.path.startswith("/fixture/"):
                     fixture_id = parsed.path.rsplit("/", 1)[-1]
-                    html = fixtures.get(fixture_id)
-                    if html is None:
+                    body = fixtures.get(fixture_id)
+                    if body is None:
                         self.send_error(404)
                         return
-                    self._send_html(html)
+                    self._send_html(body)
                     return
 
                 self.send_error(404)
 
-            def _send_html(self, html):
-                body = html.encode("utf-8")
+            def _send_html(self, body):
                 self.send_response(200)
                 self.send_header("Content-Type", "text/html; charset=utf-8")
                 self.send_header("Content-Length", str(len(body)))
@@ -113,14 +130,17 @@ class FixtureServer:
 
     def fixture_url(self, html):
         self.start()
-        fixture_id = str(uuid.uuid4())
-        self.fixtures[fixture_id] = html
+        body = html.encode("utf-8")
+        fixture_id = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.fixtures.setdefault(fixture_id, body)
         return f"{self.base_url}/fixture/{fixture_id}"
 
 
 class MCPTestClient:
-    def __init__(self, mode='docker', image_name="camoufox-mcp-server:latest", docker_platform=None, env=None):
+    def __init__(self, mode='docker', image_name="camoufox-mcp-server:latest", docker_platform=None, env=None, fixture_server=None, verbose=False):
         self.mode = mode
+        self.verbose = verbose
+        self.request_ids = itertools.count(1)
         self.image_name = image_name
         self.docker_platform = docker_platform
         self.env = env or {}
@@ -128,8 +148,13 @@ class MCPTestClient:
         self.stdout_thread = None
         self.stderr_thread = None
         self.responses = {}
-        self.stderr_lines = []
-        self.fixture_server = FixtureServer(mode)
+        self.responses_ready = threading.Condition()
+        self.stderr_lines = collections.deque(maxlen=STDERR_HISTORY_LINES)
+        self.stderr_line_count = 0
+        self.server_ready = threading.Event()
+        self.owns_fixture_server = fixture_server is None
+        self.variant_clients = {}
+        self.fixture_server = fixture_server or FixtureServer(mode)
 
     def start_server(self):
         self.fixture_server.start()
@@ -163,13 +188,12 @@ class MCPTestClient:
             process_env = os.environ.copy()
             process_env.update(server_env)
 
+        self.server_ready.clear()
         self.process = subprocess.Popen(
             command,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
             env=process_env
         )
 
@@ -183,13 +207,12 @@ class MCPTestClient:
         self._wait_for_server()
 
     def _wait_for_server(self, timeout=15):
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.server_ready.wait(0.1):
+                return
             if self.process.poll() is not None:
                 raise RuntimeError(f"Server exited early with code {self.process.returncode}")
-            if any("running on stdio" in line.lower() for line in self.stderr_lines):
-                return
-            time.sleep(0.1)
         print("Warning: server startup message was not detected before tests started.")
 
     def _read_output(self):
@@ -197,29 +220,52 @@ class MCPTestClient:
             try:
                 response = json.loads(line)
                 request_id = response.get("id")
-                if request_id:
-                    self.responses[request_id] = response
+                if request_id is not None:
+                    with self.responses_ready:
+                        self.responses[request_id] = response
+                        self.responses_ready.notify_all()
             except json.JSONDecodeError:
-                print(f"[Server STDOUT]: {line.strip()}")
+                print(f"[Server STDOUT]: {line.decode('utf-8', 'replace').strip()}")
 
     def _read_errors(self):
         for line in self.process.stderr:
-            stripped = line.strip()
+            stripped = line.decode("utf-8", "replace").strip()
             self.stderr_lines.append(stripped)
-            print(f"[Server STDERR]: {stripped}")
+            self.stderr_line_count += 1
+            if not self.server_ready.is_set() and "running on stdio" in stripped.lower():
+                self.server_ready.set()
+            if self.verbose:
+                print(f"[Server STDERR]: {stripped}")
+
+    def stderr_since(self, mark):
+        lines = list(self.stderr_lines)
+        new_lines = self.stderr_line_count - mark
+        return lines[-new_lines:] if new_lines > 0 else []
 
     def send_request(self, method, params):
-        request_id = str(uuid.uuid4())
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params
-        }
-        print(f"Sending request: {json.dumps(request)}")
-        self.process.stdin.write(json.dumps(request) + "\n")
+        return self.send_requests([(method, params)])[0]
+
+    def send_requests(self, calls):
+        # The MCP stdio transport has no JSON-RPC batch support, so pipeline
+        # one line per request in a single write and flush.
+        request_ids = []
+        lines = []
+        for method, params in calls:
+            request_id = next(self.request_ids)
+            request = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }
+            request_json = JSON_ENCODER.encode(request)
+            if self.verbose:
+                print("Sending request:", request_json)
+            request_ids.append(request_id)
+            lines.append(request_json + "\n")
+        self.process.stdin.write("".join(lines).encode())
         self.process.stdin.flush()
-        return request_id
+        return request_ids
 
     def send_notification(self, method, params):
         notification = {
@@ -227,8 +273,10 @@ class MCPTestClient:
             "method": method,
             "params": params
         }
-        print(f"Sending notification: {json.dumps(notification)}")
-        self.process.stdin.write(json.dumps(notification) + "\n")
+        notification_json = JSON_ENCODER.encode(notification)
+        if self.verbose:
+            print("Sending notification:", notification_json)
+        self.process.stdin.write((notification_json + "\n").encode())
         self.process.stdin.flush()
 
     def _call_tool(self, method, params, timeout=30):
@@ -238,20 +286,28 @@ class MCPTestClient:
         })
         return self.get_response(request_id, timeout=timeout)
 
+    def _call_tools(self, calls, timeout=30):
+        request_ids = self.send_requests([
+            ("tools/call", {"name": name, "arguments": arguments}) for name, arguments in calls
+        ])
+        return [self.get_response(request_id, timeout=timeout) for request_id in request_ids]
+
     def get_response(self, request_id, timeout=30):
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if request_id in self.responses:
+        with self.responses_ready:
+            if self.responses_ready.wait_for(lambda: request_id in self.responses, timeout=timeout):
                 return self.responses.pop(request_id)
-            time.sleep(0.1)
         return None
 
     def stop_server(self):
+        for client in self.variant_clients.values():
+            client.stop_server()
+        self.variant_clients.clear()
         if self.process:
             self.process.terminate()
             self.process.wait()
             self.process = None
-        self.fixture_server.stop()
+        if self.owns_fixture_server:
+            self.fixture_server.stop()
         print("Server stopped.")
 
     def get_tool_text(self, response):
@@ -263,10 +319,20 @@ class MCPTestClient:
         return json.loads(self.get_tool_text(response))
 
 
+    def assert_tool_ok(self, response, message=None):
+        assert response and not response.get("result", {}).get("isError"), message or response
+        return response
+
+    def assert_tool_error(self, response, expected_text=None, message=None):
+        assert response and response.get("result", {}).get("isError"), message or response
+        if expected_text is not None:
+            text = self.get_tool_text(response)
+            assert expected_text in text.lower(), text
+        return response
+
     def _run_tool(self, name, arguments, timeout=60):
         response = self._call_tool(name, arguments, timeout=timeout)
-        assert response and not response.get("result", {}).get("isError"), f"{name} call failed: {response}"
-        return response
+        return self.assert_tool_ok(response, f"{name} call failed: {response}")
 
     def _run_browse(self, arguments, timeout=60):
         return self._run_tool("browse", arguments, timeout=timeout)
@@ -320,23 +386,37 @@ class MCPTestClient:
         env.update(extra or {})
         return env
 
-    def test_handshake(self):
-        print("--- Running Test: Handshake ---")
-        # 1. Client sends InitializeRequest
-        init_id = self.send_request("initialize", {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "test-client",
-                "version": "1.0.0"
-            }
-        })
+    def _variant_client(self, env):
+        return MCPTestClient(
+            mode=self.mode,
+            image_name=self.image_name,
+            docker_platform=self.docker_platform,
+            env=env,
+            fixture_server=self.fixture_server,
+            verbose=self.verbose
+        )
+
+    def _shared_variant_client(self, env):
+        # Started once per distinct env and stopped with this client.
+        key = tuple(sorted(env.items()))
+        client = self.variant_clients.get(key)
+        if client is None:
+            client = self._variant_client(env)
+            self.variant_clients[key] = client
+            client.start_server()
+            client.test_handshake()
+        return client
+
+    def _initialize(self):
+        init_id = self.send_request("initialize", INITIALIZE_PARAMS)
         init_response = self.get_response(init_id)
         assert init_response and "result" in init_response, "Handshake failed at InitializeRequest"
-        print("InitializeRequest successful.")
-
-        # 2. Client sends InitializedNotification (no ID)
+        # stdio messages are handled in order, so the next request cannot
+        # overtake this notification.
         self.send_notification("initialized", {})
-        print("InitializedNotification sent.")
-        time.sleep(1) # Allow server to process notification
+        return init_response
+
+    def test_handshake(self):
+        print("--- Running Test: Handshake ---")
+        self._initialize()
         print("Handshake complete!")
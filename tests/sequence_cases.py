@@ -1,10 +1,3 @@
-import json
-import subprocess
-import threading
-import time
-
-from harness import MCPTestClient, TEST_ENV
-
 class SequenceCases:
     def test_call_tool_sequence_click_link(self):
         print("--- Running Test: Call Tool - Browse Sequence Click Link ---")
@@ -133,18 +126,42 @@ class SequenceCases:
     def test_call_tool_sequence_rejects_timeout_budget(self):
         print("--- Running Test: Call Tool - Browse Sequence Rejects Timeout Budget ---")
         response = self._call_tool("browse_sequence", {
-            "url": "https://example.com",
+            "url": self._example_url(),
             "actions": [
                 {"type": "waitFor", "timeout": 60000},
                 {"type": "waitFor", "timeout": 60000},
                 {"type": "waitFor", "timeout": 60000}
             ]
         }, timeout=10)
-        assert response and response.get("result", {}).get("isError"), response
+        self.assert_tool_error(response)
         assert "Sequence timeout budget exceeds server policy" in self.get_tool_text(response), response
         print("CallTool sequence timeout budget rejection test passed.")
 
 
+    def test_call_tool_sequence_wait_for_selector_or_text(self):
+        print("--- Running Test: Call Tool - Browse Sequence Wait For Selector Or Text ---")
+        html = """<!doctype html>
+<html>
+<body>
+  <p id="status">loading</p>
+  <script>
+    setTimeout(() => { document.getElementById('status').textContent = 'Ready now'; }, 300);
+  </script>
+</body>
+</html>"""
+        response = self._run_sequence({
+            "url": self._fixture_url(html),
+            "actions": [
+                {"type": "waitFor", "selector": "#never", "text": "Ready now", "timeout": 5000}
+            ],
+            "maxChars": 2000
+        }, timeout=90)
+        payload = self.get_tool_payload(response)
+        assert payload["actions"][0]["status"] == "ok", payload
+        assert payload["actions"][0]["text"] == "Ready now", payload
+        assert "Ready now" in payload["text"], f"Expected text wait to resolve: {payload}"
+        print("CallTool sequence wait for selector or text test passed.")
+
     def test_call_tool_sequence_scrolls_selector_element(self):
         print("--- Running Test: Call Tool - Browse Sequence Scroll Selector Element ---")
         html = """<!doctype html>
@@ -176,8 +193,7 @@ class SequenceCases:
             "url": self._url("/redirect-to?url=http%3A%2F%2F127.0.0.1%3A80"),
             "actions": []
         }, timeout=30)
-        assert response and response.get("result", {}).get("isError"), f"Private sequence redirect was not rejected: {response}"
-        assert "blocked unsafe browser request" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "blocked unsafe browser request", f"Private sequence redirect was not rejected: {response}")
         print("CallTool sequence private redirect rejection test passed.")
 
     def test_call_tool_sequence_rejects_evaluate_by_default(self):
@@ -188,6 +204,5 @@ class SequenceCases:
                 {"type": "evaluate", "expression": "document.title"}
             ]
         }, timeout=60)
-        assert response and response.get("result", {}).get("isError"), f"Evaluate action was not rejected: {response}"
-        assert "evaluate action is disabled" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "evaluate action is disabled", f"Evaluate action was not rejected: {response}")
         print("CallTool sequence evaluate rejection test passed.")
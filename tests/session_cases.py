@@ -1,10 +1,5 @@
-import json
-import subprocess
-import threading
 import time
 
-from harness import MCPTestClient, TEST_ENV
-
 class SessionCases:
     def test_call_tool_session_flow_and_max_sessions(self):
         print("--- Running Test: Call Tool - Session Flow And Max Sessions ---")
@@ -12,8 +7,7 @@ class SessionCases:
         session_id = self.get_tool_payload(start_response)["sessionId"]
         try:
             second_response = self._call_tool("browse_session_start", {}, timeout=10)
-            assert second_response and second_response.get("result", {}).get("isError"), second_response
-            assert "too many active sessions" in self.get_tool_text(second_response).lower()
+            self.assert_tool_error(second_response, "too many active sessions")
 
             html = """<!doctype html>
 <html>
@@ -79,27 +73,21 @@ class SessionCases:
             }, timeout=90)
             assert "waiting" in self.get_tool_payload(navigate)["text"]
 
-            action_id = self.send_request("tools/call", {
-                "name": "browse_session_action",
-                "arguments": {
+            action_response, snapshot_response = self._call_tools([
+                ("browse_session_action", {
                     "sessionId": session_id,
                     "action": {"type": "waitFor", "selector": "#ready", "timeout": 5000},
                     "maxChars": 1000,
                     "maxElements": 20
-                }
-            })
-            snapshot_id = self.send_request("tools/call", {
-                "name": "browse_session_snapshot",
-                "arguments": {
+                }),
+                ("browse_session_snapshot", {
                     "sessionId": session_id,
                     "maxChars": 1000,
                     "maxElements": 20
-                }
-            })
-            action_response = self.get_response(action_id, timeout=90)
-            snapshot_response = self.get_response(snapshot_id, timeout=90)
-            assert action_response and not action_response.get("result", {}).get("isError"), action_response
-            assert snapshot_response and not snapshot_response.get("result", {}).get("isError"), snapshot_response
+                })
+            ], timeout=90)
+            self.assert_tool_ok(action_response)
+            self.assert_tool_ok(snapshot_response)
             snapshot_payload = self.get_tool_payload(snapshot_response)
             assert "ready from queued action" in snapshot_payload["text"], snapshot_payload
         finally:
@@ -119,7 +107,7 @@ class SessionCases:
                 "timeout": 5000,
                 "maxChars": 1000
             }, timeout=15)
-            assert response and response.get("result", {}).get("isError"), response
+            self.assert_tool_error(response)
             error_text = self.get_tool_text(response)
             assert "session-secret" not in error_text, error_text
             assert "token=" not in error_text, error_text
@@ -147,13 +135,13 @@ class SessionCases:
             started = time.time()
             close_response = self._call_tool("browse_session_close", {"sessionId": session_id}, timeout=15)
             elapsed = time.time() - started
-            assert close_response and not close_response.get("result", {}).get("isError"), close_response
+            self.assert_tool_ok(close_response)
             assert self.get_tool_payload(close_response)["closed"] is True
             assert elapsed < 15, f"Session close waited too long behind active operation: {elapsed:.2f}s"
             closed = True
 
             navigate_response = self.get_response(navigate_id, timeout=15)
-            assert navigate_response and navigate_response.get("result", {}).get("isError"), navigate_response
+            self.assert_tool_error(navigate_response)
         finally:
             if not closed:
                 close_response = self._call_tool("browse_session_close", {"sessionId": session_id}, timeout=30)
@@ -236,20 +224,12 @@ class SessionCases:
 
     def test_call_tool_session_captcha_attempt_autonomous_strategy(self):
         print("--- Running Test: Call Tool - Session CAPTCHA Attempt Autonomous Strategy ---")
-        autonomous_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({"CAPTCHA_AUTONOMOUS": "true"})
-        )
+        autonomous_client = self._shared_variant_client(self._test_env({"CAPTCHA_AUTONOMOUS": "true"}))
+        start_response = autonomous_client._run_tool("browse_session_start", {}, timeout=90)
+        session_id = autonomous_client.get_tool_payload(start_response)["sessionId"]
         try:
-            autonomous_client.start_server()
-            autonomous_client.test_handshake()
-            start_response = autonomous_client._run_tool("browse_session_start", {}, timeout=90)
-            session_id = autonomous_client.get_tool_payload(start_response)["sessionId"]
-            try:
-                captcha_src = autonomous_client._url("/recaptcha/api2/anchor")
-                html = f"""<!doctype html>
+            captcha_src = autonomous_client._url("/recaptcha/api2/anchor")
+            html = f"""<!doctype html>
 <html>
 <head><title>Just a moment</title></head>
 <body>
@@ -257,58 +237,44 @@ class SessionCases:
   <iframe title="recaptcha challenge" src="{captcha_src}"></iframe>
 </body>
 </html>"""
-                response = autonomous_client._run_tool("browse_session_navigate", {
-                    "sessionId": session_id,
-                    "url": autonomous_client._fixture_url(html),
-                    "captchaPolicy": "attempt",
-                    "maxChars": 1000
-                }, timeout=90)
-                payload = autonomous_client.get_tool_payload(response)
-                assert payload["captchaDetected"] is True, payload
-                assert payload["challengeHandling"] == "llm_assisted", payload
-                assert "Autonomous challenge handling is enabled" in payload["message"], payload
-                assert "challengeProvider" in payload["suggestedStrategy"], payload
-                assert "bounded screenshot" in payload["suggestedStrategy"], payload
-                assert "browse_session_action" not in payload["suggestedStrategy"], payload
-                assert "clickMode" not in payload["suggestedStrategy"], payload
-                assert payload["challengePlaybook"], payload
-                assert "reCAPTCHA" in payload["challengePlaybook"], payload
-                assert "captchaIframes" in payload["challengePlaybook"], payload
-                assert "bounded screenshot" in payload["challengePlaybook"], payload
-                assert "@.claude" not in payload["challengePlaybook"], payload
-            finally:
-                close_response = autonomous_client._run_tool("browse_session_close", {"sessionId": session_id}, timeout=30)
-                assert autonomous_client.get_tool_payload(close_response)["closed"] is True
+            response = autonomous_client._run_tool("browse_session_navigate", {
+                "sessionId": session_id,
+                "url": autonomous_client._fixture_url(html),
+                "captchaPolicy": "attempt",
+                "maxChars": 1000
+            }, timeout=90)
+            payload = autonomous_client.get_tool_payload(response)
+            assert payload["captchaDetected"] is True, payload
+            assert payload["challengeHandling"] == "llm_assisted", payload
+            assert "Autonomous challenge handling is enabled" in payload["message"], payload
+            assert "challengeProvider" in payload["suggestedStrategy"], payload
+            assert "bounded screenshot" in payload["suggestedStrategy"], payload
+            assert "browse_session_action" not in payload["suggestedStrategy"], payload
+            assert "clickMode" not in payload["suggestedStrategy"], payload
+            assert payload["challengePlaybook"], payload
+            assert "reCAPTCHA" in payload["challengePlaybook"], payload
+            assert "captchaIframes" in payload["challengePlaybook"], payload
+            assert "bounded screenshot" in payload["challengePlaybook"], payload
+            assert "@.claude" not in payload["challengePlaybook"], payload
         finally:
-            autonomous_client.stop_server()
+            close_response = autonomous_client._run_tool("browse_session_close", {"sessionId": session_id}, timeout=30)
+            assert autonomous_client.get_tool_payload(close_response)["closed"] is True
         print("CallTool session CAPTCHA autonomous strategy test passed.")
 
     def test_call_tool_session_start_enforces_concurrent_max_sessions(self):
         print("--- Running Test: Call Tool - Concurrent Session Max Enforcement ---")
-        session_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({
-                "CAMOUFOX_MCP_MAX_CONCURRENCY": "2",
-                "CAMOUFOX_MCP_MAX_SESSIONS": "1"
-            })
-        )
+        session_client = self._variant_client(self._test_env({
+            "CAMOUFOX_MCP_MAX_CONCURRENCY": "2",
+            "CAMOUFOX_MCP_MAX_SESSIONS": "1"
+        }))
         sessions = []
         try:
             session_client.start_server()
             session_client.test_handshake()
-            request_ids = [
-                session_client.send_request("tools/call", {
-                    "name": "browse_session_start",
-                    "arguments": {}
-                }),
-                session_client.send_request("tools/call", {
-                    "name": "browse_session_start",
-                    "arguments": {}
-                })
-            ]
-            responses = [session_client.get_response(request_id, timeout=90) for request_id in request_ids]
+            responses = session_client._call_tools([
+                ("browse_session_start", {}),
+                ("browse_session_start", {})
+            ], timeout=90)
             assert all(responses), responses
             errors = [response for response in responses if response.get("result", {}).get("isError")]
             successes = [response for response in responses if not response.get("result", {}).get("isError")]
@@ -319,7 +285,7 @@ class SessionCases:
         finally:
             for session_id in sessions:
                 close_response = session_client._call_tool("browse_session_close", {"sessionId": session_id}, timeout=30)
-                assert close_response and not close_response.get("result", {}).get("isError"), close_response
+                session_client.assert_tool_ok(close_response)
             session_client.stop_server()
         print("CallTool concurrent session max enforcement test passed.")
 
@@ -356,7 +322,7 @@ class SessionCases:
                     "sessionId": session_id,
                     "maxChars": 1000
                 }, timeout=30)
-                assert snapshot and snapshot.get("result", {}).get("isError"), snapshot
+                self.assert_tool_error(snapshot)
                 snapshot_error = self.get_tool_text(snapshot).lower()
                 assert "not allowed" in snapshot_error or "blocked unsafe" in snapshot_error, snapshot
         finally:
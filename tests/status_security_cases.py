@@ -1,24 +1,21 @@
-import json
-import subprocess
-import threading
 import time
 
-from harness import MCPTestClient, TEST_ENV
-
 class StatusSecurityCases:
+    def _assert_strict_client_rejects(self, urls, message):
+        strict_client = self._shared_variant_client({})
+        for url in urls:
+            response = strict_client._call_tool("browse", {"url": url}, timeout=10)
+            strict_client.assert_tool_error(response, "not allowed", f"{message}: {url}: {response}")
+
+    def _assert_browse_option_rejected(self, options, expected_text, message):
+        arguments = {"url": self._example_url()}
+        arguments.update(options)
+        response = self._call_tool("browse", arguments, timeout=10)
+        return self.assert_tool_error(response, expected_text, f"{message}: {response}")
+
     def test_handshake(self):
         print("--- Running Test: Handshake ---")
-        # 1. Client sends InitializeRequest
-        init_id = self.send_request("initialize", {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "test-client",
-                "version": "1.0.0"
-            }
-        })
-        init_response = self.get_response(init_id)
-        assert init_response and "result" in init_response, "Handshake failed at InitializeRequest"
+        init_response = self._initialize()
         capabilities = init_response["result"]["capabilities"]
         camoufox_extension = capabilities.get("extensions", {}).get("camoufox-mcp")
         assert camoufox_extension, f"Initialize response missing camoufox-mcp extension: {capabilities}"
@@ -28,12 +25,6 @@ class StatusSecurityCases:
         assert camoufox_extension["policy"]["defaultWaitStrategy"] == "domcontentloaded", camoufox_extension
         assert camoufox_extension["policy"]["defaultStealthProfile"] == "normal", camoufox_extension
         assert camoufox_extension["tools"]["browseSessionNavigateWaitStrategy"] is True, camoufox_extension
-        print("InitializeRequest successful.")
-
-        # 2. Client sends InitializedNotification (no ID)
-        self.send_notification("initialized", {})
-        print("InitializedNotification sent.")
-        time.sleep(1) # Allow server to process notification
         print("Handshake complete!")
 
     def test_list_tools(self):
@@ -171,12 +162,7 @@ class StatusSecurityCases:
 
     def test_call_tool_status_reports_declared_network_sandbox(self):
         print("--- Running Test: Call Tool - Status Reports Declared Network Sandbox ---")
-        sandbox_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({"CAMOUFOX_MCP_NETWORK_SANDBOX": "1"})
-        )
+        sandbox_client = self._variant_client(self._test_env({"CAMOUFOX_MCP_NETWORK_SANDBOX": "1"}))
         try:
             sandbox_client.start_server()
             sandbox_client.test_handshake()
@@ -193,15 +179,10 @@ class StatusSecurityCases:
 
     def test_call_tool_status_reports_strict_declared_network_sandbox(self):
         print("--- Running Test: Call Tool - Status Reports Strict Declared Network Sandbox ---")
-        sandbox_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({
-                "CAMOUFOX_MCP_NETWORK_SANDBOX": "1",
-                "CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX": "1"
-            })
-        )
+        sandbox_client = self._variant_client(self._test_env({
+            "CAMOUFOX_MCP_NETWORK_SANDBOX": "1",
+            "CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX": "1"
+        }))
         try:
             sandbox_client.start_server()
             sandbox_client.test_handshake()
@@ -218,30 +199,15 @@ class StatusSecurityCases:
 
     def test_call_tool_status_reports_autonomous_captcha_policy(self):
         print("--- Running Test: Call Tool - Status Reports Autonomous CAPTCHA Policy ---")
-        autonomous_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({"CAPTCHA_AUTONOMOUS": "true"})
-        )
-        try:
-            autonomous_client.start_server()
-            autonomous_client.test_handshake()
-            response = autonomous_client._run_status()
-            payload = autonomous_client.get_tool_payload(response)
-            assert payload["captchaAutonomous"] is True, payload
-        finally:
-            autonomous_client.stop_server()
+        autonomous_client = self._shared_variant_client(self._test_env({"CAPTCHA_AUTONOMOUS": "true"}))
+        response = autonomous_client._run_status()
+        payload = autonomous_client.get_tool_payload(response)
+        assert payload["captchaAutonomous"] is True, payload
         print("CallTool autonomous CAPTCHA status test passed.")
 
     def test_server_requires_declared_network_sandbox_when_strict(self):
         print("--- Running Test: Server Requires Declared Network Sandbox When Strict ---")
-        strict_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env=self._test_env({"CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX": "1"})
-        )
+        strict_client = self._variant_client(self._test_env({"CAMOUFOX_MCP_REQUIRE_NETWORK_SANDBOX": "1"}))
         try:
             try:
                 strict_client.start_server()
@@ -255,22 +221,25 @@ class StatusSecurityCases:
         finally:
             strict_client.stop_server()
 
-    def test_call_tool_browse_rejects_localhost(self):
-        print("--- Running Test: Call Tool - Reject Localhost URL ---")
-        strict_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env={}
-        )
+    def test_server_quiet_mode_suppresses_progress_logs(self):
+        print("--- Running Test: Server Quiet Mode Suppresses Progress Logs ---")
+        quiet_client = self._variant_client(self._test_env({"CAMOUFOX_MCP_QUIET": "1"}))
         try:
-            strict_client.start_server()
-            strict_client.test_handshake()
-            response = strict_client._call_tool("browse", {"url": "http://127.0.0.1:80"}, timeout=10)
-            assert response and response.get("result", {}).get("isError"), f"Localhost URL was not rejected: {response}"
-            assert "not allowed" in strict_client.get_tool_text(response).lower()
+            quiet_client.start_server()
+            quiet_client.test_handshake()
+            quiet_client._run_browse({"url": self._example_url(), "maxChars": 1000}, timeout=90)
+            time.sleep(0.2)
+            stderr_text = "\n".join(quiet_client.stderr_lines)
+            assert "running on stdio" in stderr_text.lower(), stderr_text
+            for progress_line in ("Launching browser", "Successfully retrieved content", "Closing browser"):
+                assert progress_line not in stderr_text, stderr_text
         finally:
-            strict_client.stop_server()
+            quiet_client.stop_server()
+        print("Server quiet mode progress log test passed.")
+
+    def test_call_tool_browse_rejects_localhost(self):
+        print("--- Running Test: Call Tool - Reject Localhost URL ---")
+        self._assert_strict_client_rejects(["http://127.0.0.1:80"], "Localhost URL was not rejected")
         print("CallTool localhost rejection test passed.")
 
     def test_call_tool_browse_rejects_localhost_redirect(self):
@@ -278,87 +247,40 @@ class StatusSecurityCases:
         response = self._call_tool("browse", {
             "url": self._url("/redirect-to?url=http%3A%2F%2F127.0.0.1%3A80")
         }, timeout=30)
-        assert response and response.get("result", {}).get("isError"), f"Localhost redirect was not rejected: {response}"
-        assert "blocked unsafe browser request" in self.get_tool_text(response).lower()
+        self.assert_tool_error(response, "blocked unsafe browser request", f"Localhost redirect was not rejected: {response}")
         print("CallTool localhost redirect rejection test passed.")
 
     def test_call_tool_browse_rejects_unsafe_options(self):
         print("--- Running Test: Call Tool - Reject Unsafe Browser Options ---")
-        stderr_start = len(self.stderr_lines)
-        response = self._call_tool("browse", {
-            "url": self._example_url(),
-            "firefox_user_prefs": {"privacy.resistFingerprinting": True}
-        }, timeout=10)
-        assert response and response.get("result", {}).get("isError"), f"Unsafe browser options were not rejected: {response}"
-        assert "unsafe browser options" in self.get_tool_text(response).lower()
-        new_stderr = "\n".join(self.stderr_lines[stderr_start:])
+        stderr_mark = self.stderr_line_count
+        self._assert_browse_option_rejected({"firefox_user_prefs": {"privacy.resistFingerprinting": True}}, "unsafe browser options", "Unsafe browser options were not rejected")
+        new_stderr = "\n".join(self.stderr_since(stderr_mark))
         assert "firefox_user_prefs requires CAMOUFOX_MCP_ALLOW_UNSAFE_OPTIONS=1" in new_stderr, new_stderr
         print("CallTool unsafe browser options rejection test passed.")
 
     def test_call_tool_browse_rejects_excluded_addons(self):
         print("--- Running Test: Call Tool - Reject Excluded Addons ---")
-        response = self._call_tool("browse", {
-            "url": self._example_url(),
-            "exclude_addons": ["ublock_origin"]
-        }, timeout=10)
-        assert response and response.get("result", {}).get("isError"), f"Excluded addons were not rejected: {response}"
-        assert "unsafe browser options" in self.get_tool_text(response).lower()
+        self._assert_browse_option_rejected({"exclude_addons": ["ublock_origin"]}, "unsafe browser options", "Excluded addons were not rejected")
         print("CallTool excluded addons rejection test passed.")
 
     def test_call_tool_browse_rejects_private_proxy_string(self):
         print("--- Running Test: Call Tool - Reject Private Proxy String ---")
-        response = self._call_tool("browse", {
-            "url": self._example_url(),
-            "proxy": "http://127.0.0.1:8080"
-        }, timeout=10)
-        assert response and response.get("result", {}).get("isError"), f"Private proxy string was not rejected: {response}"
-        assert "not allowed" in self.get_tool_text(response).lower()
+        self._assert_browse_option_rejected({"proxy": "http://127.0.0.1:8080"}, "not allowed", "Private proxy string was not rejected")
         print("CallTool private proxy string rejection test passed.")
 
     def test_call_tool_browse_rejects_private_proxy_object(self):
         print("--- Running Test: Call Tool - Reject Private Proxy Object ---")
-        response = self._call_tool("browse", {
-            "url": self._example_url(),
-            "proxy": {"server": "http://169.254.169.254:80"}
-        }, timeout=10)
-        assert response and response.get("result", {}).get("isError"), f"Private proxy object was not rejected: {response}"
-        assert "not allowed" in self.get_tool_text(response).lower()
+        self._assert_browse_option_rejected({"proxy": {"server": "http://169.254.169.254:80"}}, "not allowed", "Private proxy object was not rejected")
         print("CallTool private proxy object rejection test passed.")
 
     def test_call_tool_browse_rejects_ipv6_loopback(self):
         print("--- Running Test: Call Tool - Reject IPv6 Loopback URL ---")
-        strict_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env={}
-        )
-        try:
-            strict_client.start_server()
-            strict_client.test_handshake()
-            response = strict_client._call_tool("browse", {"url": "http://[::1]/"}, timeout=10)
-            assert response and response.get("result", {}).get("isError"), f"IPv6 loopback URL was not rejected: {response}"
-            assert "not allowed" in strict_client.get_tool_text(response).lower()
-        finally:
-            strict_client.stop_server()
+        self._assert_strict_client_rejects(["http://[::1]/"], "IPv6 loopback URL was not rejected")
         print("CallTool IPv6 loopback rejection test passed.")
 
     def test_call_tool_browse_rejects_ipv4_mapped_loopback(self):
         print("--- Running Test: Call Tool - Reject IPv4-Mapped Loopback URL ---")
-        strict_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env={}
-        )
-        try:
-            strict_client.start_server()
-            strict_client.test_handshake()
-            response = strict_client._call_tool("browse", {"url": "http://[::ffff:127.0.0.1]/"}, timeout=10)
-            assert response and response.get("result", {}).get("isError"), f"IPv4-mapped loopback URL was not rejected: {response}"
-            assert "not allowed" in strict_client.get_tool_text(response).lower()
-        finally:
-            strict_client.stop_server()
+        self._assert_strict_client_rejects(["http://[::ffff:127.0.0.1]/"], "IPv4-mapped loopback URL was not rejected")
         print("CallTool IPv4-mapped loopback rejection test passed.")
 
     def test_call_tool_browse_rejects_unusual_private_ip_forms(self):
@@ -377,21 +299,7 @@ class StatusSecurityCases:
             "http://[2001:db8::1]/",
             "http://[2002::1]/"
         ]
-        strict_client = MCPTestClient(
-            mode=self.mode,
-            image_name=self.image_name,
-            docker_platform=self.docker_platform,
-            env={}
-        )
-        try:
-            strict_client.start_server()
-            strict_client.test_handshake()
-            for url in urls:
-                response = strict_client._call_tool("browse", {"url": url}, timeout=10)
-                assert response and response.get("result", {}).get("isError"), f"Unusual private URL was not rejected: {url}: {response}"
-                assert "not allowed" in strict_client.get_tool_text(response).lower()
-        finally:
-            strict_client.stop_server()
+        self._assert_strict_client_rejects(urls, "Unusual private URL was not rejected")
         print("CallTool unusual private IP form rejection test passed.")
 
     def test_call_tool_browse_rejects_special_ipv4_ranges(self):
@@ -411,6 +319,5 @@ class StatusSecurityCases:
         ]
         for address in addresses:
             response = self._call_tool("browse", {"url": f"http://{address}/"}, timeout=10)
-            assert response and response.get("result", {}).get("isError"), f"Special IPv4 URL was not rejected: {address}: {response}"
-            assert "not allowed" in self.get_tool_text(response).lower()
+            self.assert_tool_error(response, "not allowed", f"Special IPv4 URL was not rejected: {address}: {response}")
         print("CallTool special IPv4 range rejection test passed.")
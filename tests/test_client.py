@@ -18,6 +18,7 @@ TEST_ORDER = [
     "test_call_tool_status_reports_strict_declared_network_sandbox",
     "test_call_tool_status_reports_autonomous_captcha_policy",
     "test_server_requires_declared_network_sandbox_when_strict",
+    "test_server_quiet_mode_suppresses_progress_logs",
     "test_call_tool_browse_rejects_localhost",
     "test_call_tool_browse_rejects_localhost_redirect",
     "test_call_tool_browse_rejects_unsafe_options",
@@ -47,6 +48,7 @@ TEST_ORDER = [
     "test_call_tool_sequence_click_auto_falls_back_to_dom",
     "test_call_tool_sequence_form_actions",
     "test_call_tool_sequence_rejects_timeout_budget",
+    "test_call_tool_sequence_wait_for_selector_or_text",
     "test_call_tool_session_flow_and_max_sessions",
     "test_call_tool_session_serializes_overlapping_operations",
     "test_call_tool_session_navigation_error_redacts_url",
@@ -71,16 +73,29 @@ TEST_ORDER = [
     "test_call_tool_browse_rejects_denylisted_unsafe_options_when_allowed",
 ]
 
+def select_tests(patterns):
+    if not patterns:
+        return list(TEST_ORDER)
+    selected = [name for name in TEST_ORDER if any(pattern in name for pattern in patterns)]
+    if not selected:
+        raise SystemExit(f"No tests match: {', '.join(patterns)}")
+    if selected[0] != "test_handshake":
+        selected.insert(0, "test_handshake")
+    return selected
+
 class CamoufoxMCPTestClient(StatusSecurityCases, BrowseCases, BrowseEdgeCases, SequenceCases, SessionCases, MCPTestClient):
-    def run_tests(self):
+    def run_tests(self, test_names=TEST_ORDER):
         try:
             self.start_server()
-            for test_name in TEST_ORDER:
+            for test_name in test_names:
                 getattr(self, test_name)()
             print("\nAll tests passed!")
             return True
         except Exception as e:
             print(f"\nAn error occurred: {e}")
+            if not self.verbose:
+                for line in list(self.stderr_lines)[-50:]:
+                    print(f"[Server STDERR]: {line}")
             return False
         finally:
             self.stop_server()
@@ -90,8 +105,11 @@ if __name__ == "__main__":
     parser.add_argument('--mode', type=str, default='docker', choices=['docker', 'local'], help='Test mode: docker or local')
     parser.add_argument('--image-name', type=str, default='camoufox-mcp-server:latest', help='Docker image name for docker mode')
     parser.add_argument('--docker-platform', type=str, help='Docker platform to pass to docker run')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Echo every request and all server stderr while tests run')
+    parser.add_argument('-k', '--filter', action='append', default=[], help='Only run tests whose name contains this substring (repeatable)')
     args = parser.parse_args()
+    test_names = select_tests(args.filter)
 
-    client = CamoufoxMCPTestClient(mode=args.mode, image_name=args.image_name, docker_platform=args.docker_platform, env=TEST_ENV)
-    ok = client.run_tests()
+    client = CamoufoxMCPTestClient(mode=args.mode, image_name=args.image_name, docker_platform=args.docker_platform, env=TEST_ENV, verbose=args.verbose)
+    ok = client.run_tests(test_names)
     raise SystemExit(0 if ok else 1)